@@ -1,16 +1,21 @@
 import pygame
+import logging
+import os
 import sys
 from src.scenes.main_menu import MainMenu
 
 #TODO redo with argparse (does it work on windows?)
 
+# Set ITI_DEBUG=1 to log the player's SQL and results to the console
+logging.basicConfig(level=logging.DEBUG if os.environ.get("ITI_DEBUG") else logging.WARNING)
+
 pygame.init()
 SCREEN = pygame.display.set_mode((1280, 720))
 pygame.display.set_caption("Interstellar Trade Inspector")
 CLOCK = pygame.time.Clock()
 
 def main():
-    current_scene = MainMenu(SCREEN)
+    current_scene = MainMenu(SCREEN, CLOCK)
 
     while True:
         next_scene = current_scene.run()
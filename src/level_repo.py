@@ -0,0 +1,63 @@
+import sqlite3
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+META_DB_PATH = os.path.join(DATA_DIR, "level_meta.sqlite")
+
+# One long-lived connection for the level metadata. sqlite3 keeps compiled
+# statements per connection, so repeated queries skip the parse/prepare step.
+META_CONN = sqlite3.connect(META_DB_PATH, cached_statements=256)
+
+# The metadata is a local, single-writer save file: synchronous=NORMAL trims the
+# fsyncs mark_solved() waits on. The journal mode is left alone: it is stored in
+# the file itself, and the shipped file must stay a single file.
+META_CONN.execute("PRAGMA synchronous=NORMAL")
+META_CONN.execute("PRAGMA temp_store=MEMORY")
+
+# level_id -> level metadata, read once at startup
+LEVELS = {
+    row[0]: {
+        "id": row[0],
+        "title": row[1],
+        "pretext": row[2],
+        "solution_sql": row[3],
+        "solved": row[4]
+    }
+    for row in META_CONN.execute("SELECT id, title, pretext, solution_sql, solved FROM Level ORDER BY id")
+}
+
+# example database path -> in-memory copy of it, shared by every level that uses that file
+_example_conns = {}
+
+
+def mark_solved(level_id):
+    """Mark a level as solved in level_meta.sqlite and in LEVELS."""
+    with META_CONN:
+        META_CONN.execute("UPDATE Level SET solved = 1 WHERE id = ?", (level_id,))
+    LEVELS[level_id]["solved"] = 1
+
+
+def example_connection(level_id):
+    """
+    Return a cached connection to an in-memory copy of a level's example
+    database. The copy is made on first use; the file itself is never written.
+    Levels falling back to the same file share one copy, which is safe because
+    check_sql always rolls its work back. The connection is in autocommit mode
+    so callers can manage savepoints.
+    """
+    db_path = os.path.join(DATA_DIR, f"level{level_id}_example.sqlite")
+
+    # Fallback if no level-specific database exists
+    if not os.path.exists(db_path):
+        db_path = os.path.join(DATA_DIR, "default_example.sqlite")
+
+    conn = _example_conns.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(":memory:", isolation_level=None, cached_statements=256)
+        src = sqlite3.connect(db_path)
+        try:
+            src.backup(conn)
+        finally:
+            src.close()
+        _example_conns[db_path] = conn
+    return conn
@@ -1,29 +1,26 @@
 import pygame
-import traceback
-import sqlite3
-import os
+import logging
+from itertools import zip_longest
 from .text_scene import TextScene
 from .sql_text_box import SQLTextBox  # new import
+from .level_select import LevelSelect
+from ..level_repo import example_connection, mark_solved
+
+# How many rows of a wrong answer to show back to the player
+RESULT_PREVIEW_ROWS = 50
+
+logger = logging.getLogger(__name__)
 
 class Level(TextScene):
-    def __init__(self, screen, level_id):
-        self.screen = screen
+    def __init__(self, screen, meta, clock):
+        super().__init__(screen)
+        self.clock = clock
         self.font = pygame.font.SysFont("arial", 22)
 
-        self.level_id = level_id
-        db_path = os.path.join(os.path.dirname(__file__), "../../data/level_meta.sqlite")
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        cur.execute("SELECT id, title, pretext, solution_sql FROM Level WHERE id = ?", (level_id,))
-        row = cur.fetchone()
-        conn.close()
-
-        self.meta = {
-            "id": row[0],
-            "title": row[1],
-            "pretext": row[2],
-            "solution_sql": row[3]
-        }
+        self.level_id = meta["id"]
+        self.meta = meta
+        # Load the example data now so the first TEST doesn't pay for it
+        self._example_conn = example_connection(self.level_id)
 
         # SQL input box instance
         self.sql_box = SQLTextBox(100, 400, 800, 200)
@@ -33,7 +30,39 @@ class Level(TextScene):
         self.back_rect = pygame.Rect(240, 600, 120, 40)
         self.result_text = ""
 
+        # Click targets and their handlers; a handler returns the next scene, if any
+        self._buttons = (
+            (self.button_rect, self._on_test),
+            (self.back_rect, self._on_back),
+        )
+
+        # Static text never changes while the level is open, so render it once
+        self._title_surf = self._render(self.font, f"{self.meta['id']}: {self.meta['title']}", (255, 255, 255))
+
+        pretext_surf = pygame.Surface((self.screen.get_width() - 100, self.screen.get_height()), pygame.SRCALPHA)
+        pretext_height = self.draw_multiline(self.meta["pretext"], (255, 255, 200), 0, 0, surface=pretext_surf)
+        pretext_height = min(pretext_height, pretext_surf.get_height())
+        self._pretext_surf = pretext_surf.subsurface((0, 0, pretext_surf.get_width(), pretext_height)).convert_alpha()
+
+        # Each button in both of its states, label included
+        self._test_normal = self._button_surface(self.button_rect, (0, 150, 0), "TEST")
+        self._test_hover = self._button_surface(self.button_rect, (0, 200, 0), "TEST")
+        self._back_normal = self._button_surface(self.back_rect, (150, 0, 0), "BACK")
+        self._back_hover = self._button_surface(self.back_rect, (200, 0, 0), "BACK")
+
+        # Only redraw when something on screen has changed
+        self._dirty = True
+        self._last_mouse_over = None
+
     def run(self):
+        # Text input and key repeat only apply while the level is on screen
+        self.sql_box.activate()
+        try:
+            return self._run()
+        finally:
+            self.sql_box.deactivate()
+
+    def _run(self):
         while True:
             mouse_pos = pygame.mouse.get_pos()
 
@@ -41,94 +70,121 @@ class Level(TextScene):
                 if event.type == pygame.QUIT:
                     return None
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if self.button_rect.collidepoint(event.pos):
-                        self.check_sql()
-                    elif self.back_rect.collidepoint(event.pos):
-                        from .level_select import LevelSelect
-                        return LevelSelect(self.screen)
-                else:
-                    self.sql_box.handle_event(event)
-
-            self.screen.fill((20, 20, 40))
-
-            # Title & pretext
-            self.screen.blit(
-                self.font.render(f"{self.meta['id']}: {self.meta['title']}", True, (255, 255, 255)),
-                (100, 20)
-            )
-            self.draw_multiline(self.meta["pretext"], (255, 255, 200), 100, 60)
-
-            # SQL input box
-            self.sql_box.draw(self.screen, self.screen)
-
-            # --- Buttons with hover ---
-            if self.button_rect.collidepoint(mouse_pos):
-                pygame.draw.rect(self.screen, (0, 200, 0), self.button_rect)
-            else:
-                pygame.draw.rect(self.screen, (0, 150, 0), self.button_rect)
-            self.screen.blit(
-                self.font.render("TEST", True, (255, 255, 255)),
-                (self.button_rect.x + 20, self.button_rect.y + 8)
-            )
-
-            if self.back_rect.collidepoint(mouse_pos):
-                pygame.draw.rect(self.screen, (200, 0, 0), self.back_rect)
-            else:
-                pygame.draw.rect(self.screen, (150, 0, 0), self.back_rect)
-            self.screen.blit(
-                self.font.render("BACK", True, (255, 255, 255)),
-                (self.back_rect.x + 20, self.back_rect.y + 8)
-            )
+                    handler = next((h for rect, h in self._buttons if rect.collidepoint(event.pos)), None)
+                    if handler is not None:
+                        next_scene = handler()
+                        if next_scene is not None:
+                            return next_scene
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self._dirty = True
+                elif self.sql_box.handle_event(event):
+                    self._dirty = True
+
+            if self.sql_box.update():
+                self._dirty = True
+
+            mouse_over = (self.button_rect.collidepoint(mouse_pos), self.back_rect.collidepoint(mouse_pos))
+            if mouse_over != self._last_mouse_over:
+                self._last_mouse_over = mouse_over
+                self._dirty = True
+
+            if self._dirty:
+                self.draw(mouse_over)
+                pygame.display.flip()
+                self._dirty = False
 
-            # Result area
-            self.draw_multiline(self.result_text, (255, 200, 200), 100, 660)
+            self.clock.tick(60)
 
-            pygame.display.flip()
+    def draw(self, mouse_over):
+        test_hover, back_hover = mouse_over
+
+        self.screen.fill((20, 20, 40))
+
+        # Title & pretext
+        self.screen.blit(self._title_surf, (100, 20))
+        self.screen.blit(self._pretext_surf, (100, 60))
+
+        # SQL input box
+        self.sql_box.draw(self.screen, self.screen)
+
+        # --- Buttons with hover ---
+        self.screen.blit(self._test_hover if test_hover else self._test_normal, self.button_rect.topleft)
+        self.screen.blit(self._back_hover if back_hover else self._back_normal, self.back_rect.topleft)
+
+        # Result area
+        self.draw_multiline(self.result_text, (255, 200, 200), 100, 660)
+
+    def _on_test(self):
+        self.check_sql()
+        self._dirty = True
+
+    def _on_back(self):
+        return LevelSelect(self.screen, self.clock)
+
+    def _button_surface(self, rect, colour, label):
+        surf = pygame.Surface(rect.size).convert()
+        surf.fill(colour)
+        surf.blit(self._render(self.font, label, (255, 255, 255)), (20, 8))
+        return surf
 
     def set_solved(self):
         """Mark the current level as solved in level_meta.sqlite."""
-        db_path = os.path.join(os.path.dirname(__file__), "../../data/level_meta.sqlite")
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
         try:
-            cur.execute("UPDATE Level SET solved = 1 WHERE id = ?", (self.level_id,))
-            conn.commit()
-            print(f"Level {self.level_id} marked as solved.")
+            mark_solved(self.level_id)
+            logger.debug("Level %s marked as solved.", self.level_id)
         except Exception as e:
-            print("Error updating solved status:", e)
-        finally:
-            conn.close()
+            logger.warning("Error updating solved status: %s", e)
 
     def check_sql(self):
-        base_path = os.path.dirname(__file__)
-        example_db = os.path.join(base_path, f"../../data/level{self.level_id}_example.sqlite")
-
-        # Fallback if no level-specific database exists
-        if not os.path.exists(example_db):
-            example_db = os.path.join(base_path, "../../data/default_example.sqlite")
-
-        conn = sqlite3.connect(example_db)
-        cur = conn.cursor()
+        conn = self._example_conn
         player_sql = self.sql_box.get_text().strip()
-        print("Player SQL:", repr(player_sql))
-        try:
-            cur.execute(self.sql_box.get_text().strip())
-            player_result = cur.fetchall()
-            print("Player result:", repr(player_result))
-
-            solution_sql = self.meta["solution_sql"]
-            #print("Game SQL:", repr(solution_sql))
-            cur.execute(solution_sql)
-            expected_result = cur.fetchall()
-            print("Expected result:", repr(expected_result))
+        logger.debug("Player SQL: %r", player_sql)
 
-            if player_result == expected_result:
+        # Everything runs inside a savepoint that is always rolled back, so the
+        # player's SQL can never change the example data between tests
+        player_cur = conn.cursor()
+        expected_cur = conn.cursor()
+        conn.execute("SAVEPOINT check_sql")
+        try:
+            player_cur.execute(player_sql)
+            expected_cur.execute(self.meta["solution_sql"])
+
+            # Compare row by row: a wrong answer stops at the first difference and
+            # neither result set is ever held in memory in full
+            player_rows = []
+            # Set when a row the player's query returned is left out of the preview
+            truncated = False
+            correct = True
+            for player_row, expected_row in zip_longest(player_cur, expected_cur):
+                if player_row is not None:
+                    if len(player_rows) < RESULT_PREVIEW_ROWS:
+                        player_rows.append(player_row)
+                    else:
+                        truncated = True
+                if player_row != expected_row:
+                    correct = False
+                    break
+
+            if correct:
+                logger.debug("Player result: %r", player_rows)
                 self.result_text = "✅ Correct!"
                 self.set_solved()
             else:
+                # Show the player (the start of) what their query returned
+                if len(player_rows) < RESULT_PREVIEW_ROWS:
+                    player_rows += player_cur.fetchmany(RESULT_PREVIEW_ROWS - len(player_rows))
+                player_result = repr(player_rows)
+                if truncated or player_cur.fetchone() is not None:
+                    player_result += " ..."
+                logger.debug("Player result: %s", player_result)
                 self.result_text = f"❌ Incorrect.\nYour result: {player_result}"
         except Exception as e:
-            print(traceback.format_exc())
+            logger.debug("check_sql failed", exc_info=True)
             self.result_text = f"Error: {e}"
         finally:
-            conn.close()
+            player_cur.close()
+            expected_cur.close()
+            # The player's SQL may already have ended the transaction itself
+            if conn.in_transaction:
+                conn.execute("ROLLBACK TO check_sql")
+                conn.execute("RELEASE check_sql")
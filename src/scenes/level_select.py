@@ -1,61 +1,85 @@
 import pygame
-import sqlite3
-import os
-from .level import Level
+from ..level_repo import LEVELS
 
 class LevelSelect:
-    def __init__(self, screen):
+    def __init__(self, screen, clock):
         self.screen = screen
+        self.clock = clock
         self.font = pygame.font.SysFont("arial", 28)
         self.status_font = pygame.font.SysFont("arial", 20, italic=True)
-        self.levels = []
+        self.levels = list(LEVELS.values())
+        self._rects = [pygame.Rect(100, 100 + 50 * i, 600, 40) for i in range(len(self.levels))]
 
-        db_path = os.path.join(os.path.dirname(__file__), "../../data/level_meta.sqlite")
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        cur.execute("SELECT id, title, solved FROM Level ORDER BY id;")
-        self.levels = cur.fetchall()
-        conn.close()
+        # The list is static while this screen is open, so render it once;
+        # hovered rows are drawn on top from self._hover_cache
+        self._list_surf = pygame.Surface((700, 50 * len(self.levels))).convert()
+        self._list_surf.fill((10, 10, 30))
+        for i, level in enumerate(self.levels):
+            self._list_surf.blit(self._render_row(level, (50, 50, 100)), (0, 50 * i))
+        self._hover_cache = {}
+
+        # Only redraw when something on screen has changed
+        self._dirty = True
+        self._last_mouse_over = None
 
     def run(self):
         while True:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
+            # Nothing animates here, so sleep until there's input (or the timeout)
+            for event in (pygame.event.wait(50), *pygame.event.get()):
                 if event.type == pygame.QUIT:
                     return None
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    y = 100
-                    for level in self.levels:
-                        rect = pygame.Rect(100, y, 600, 40)
-                        if rect.collidepoint(event.pos):
-                            return Level(self.screen, level[0])
-                        y += 50
-
-            self.screen.fill((10, 10, 30))
-            y = 100
-            for level in self.levels:
-                rect = pygame.Rect(100, y, 600, 40)
-
-                # Highlight glow on hover
-                if rect.collidepoint(mouse_pos):
-                    colour = (80, 80, 150)
-                else:
-                    colour = (50, 50, 100)
-
-                pygame.draw.rect(self.screen, colour, rect)
-
-                # Level title
-                txt = self.font.render(f"{level[0]} - {level[1]}", True, (255, 255, 255))
-                self.screen.blit(txt, (110, y + 8))
-
-                # Solved/Unsolved status
-                if level[2]:  # solved is truthy
-                    status_text = self.status_font.render("Solved", True, (0, 255, 0))
-                else:
-                    status_text = self.status_font.render("Unsolved", True, (255, 100, 100))
-                self.screen.blit(status_text, (650, y + 10))
-
-                y += 50
-
-            pygame.display.flip()
+                    clicked = self._row_at(event.pos)
+                    if clicked != -1:
+                        # Deferred: level.py imports this module at the top
+                        from .level import Level
+                        return Level(self.screen, self.levels[clicked], self.clock)
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self._dirty = True
+
+            mouse_pos = pygame.mouse.get_pos()
+            mouse_over = self._row_at(mouse_pos)
+            if mouse_over != self._last_mouse_over:
+                self._last_mouse_over = mouse_over
+                self._dirty = True
+
+            if self._dirty:
+                self.draw(mouse_over)
+                pygame.display.flip()
+                self._dirty = False
+
+            self.clock.tick(60)
+
+    def _row_at(self, pos):
+        """Index of the level row under pos, or -1. The scan runs in C."""
+        return pygame.Rect(pos, (1, 1)).collidelist(self._rects)
+
+    def draw(self, mouse_over):
+        self.screen.fill((10, 10, 30))
+        self.screen.blit(self._list_surf, (100, 100))
+
+        # Highlight glow on hover
+        if mouse_over != -1:
+            row = self._hover_cache.get(mouse_over)
+            if row is None:
+                row = self._hover_cache[mouse_over] = self._render_row(self.levels[mouse_over], (80, 80, 150))
+            self.screen.blit(row, self._rects[mouse_over].topleft)
+
+    def _render_row(self, level, colour):
+        # The status label hangs past the end of the 600px button
+        row = pygame.Surface((700, 40)).convert()
+        row.fill((10, 10, 30))
+        pygame.draw.rect(row, colour, (0, 0, 600, 40))
+
+        # Level title
+        txt = self.font.render(f"{level['id']} - {level['title']}", True, (255, 255, 255))
+        row.blit(txt, (10, 8))
+
+        # Solved/Unsolved status
+        if level["solved"]:
+            status_text = self.status_font.render("Solved", True, (0, 255, 0))
+        else:
+            status_text = self.status_font.render("Unsolved", True, (255, 100, 100))
+        row.blit(status_text, (550, 10))
+
+        return row
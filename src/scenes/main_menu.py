@@ -3,8 +3,9 @@ import os
 from .level_select import LevelSelect
 
 class MainMenu:
-    def __init__(self, screen):
+    def __init__(self, screen, clock):
         self.screen = screen
+        self.clock = clock
         assets_dir = os.path.join(os.path.dirname(__file__), "../../assets")
         self.bg = pygame.image.load(os.path.join(assets_dir, "main_menu.png")).convert()
         self.bg = pygame.transform.scale(self.bg, self.screen.get_size())
@@ -13,24 +14,39 @@ class MainMenu:
         self.button_rect = pygame.Rect(510, 520, 245, 60)
 
         # Pre-make a semi-transparent white surface for hover
-        self.hover_surface = pygame.Surface(self.button_rect.size, pygame.SRCALPHA)
+        self.hover_surface = pygame.Surface(self.button_rect.size, pygame.SRCALPHA).convert_alpha()
         self.hover_surface.fill((255, 255, 255, 100))  # RGBA, alpha=100 ~ fairly transparent
 
+        # Only redraw when something on screen has changed
+        self._dirty = True
+        self._last_mouse_over = None
+
     def run(self):
         while True:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
+            # Nothing animates here, so sleep until there's input (or the timeout)
+            for event in (pygame.event.wait(50), *pygame.event.get()):
                 if event.type == pygame.QUIT:
                     return None
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if self.button_rect.collidepoint(event.pos):
-                        return LevelSelect(self.screen)
+                        return LevelSelect(self.screen, self.clock)
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self._dirty = True
+
+            mouse_pos = pygame.mouse.get_pos()
+            mouse_over = self.button_rect.collidepoint(mouse_pos)
+            if mouse_over != self._last_mouse_over:
+                self._last_mouse_over = mouse_over
+                self._dirty = True
+
+            if self._dirty:
+                self.screen.blit(self.bg, (0, 0))
 
-            self.screen.blit(self.bg, (0, 0))
+                # Draw transparent hover effect if mouse is over button
+                if mouse_over:
+                    self.screen.blit(self.hover_surface, self.button_rect.topleft)
 
-            # Draw transparent hover effect if mouse is over button
-            if self.button_rect.collidepoint(mouse_pos):
-                self.screen.blit(self.hover_surface, self.button_rect.topleft)
+                pygame.display.flip()
+                self._dirty = False
 
-            pygame.display.flip()
+            self.clock.tick(60)
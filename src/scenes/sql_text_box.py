@@ -9,98 +9,142 @@ class SQLTextBox:
 
     CARET_BLINK_INTERVAL = 500  # ms
 
-    def draw_multiline(self, text, color, x, y, max_width=800, font=None):
-        if font is None:
-            font = self.font
-
-        paragraphs = text.split("\n")  # keep manual breaks
-        offset = 0
-        caret_pos = None  # store caret position
-
-        # We'll build lines fully so we can know where caret goes
-        for paragraph in paragraphs:
-            words = paragraph.split(" ")
-            current_line = ""
-
-            for word in words:
-                test_line = current_line + ("" if current_line == "" else " ") + word
-                if font.size(test_line)[0] <= max_width:
-                    current_line = test_line
-                else:
-                    rendered = font.render(current_line, True, color)
-                    self.screen.blit(rendered, (x, y + offset))
-                    offset += rendered.get_height() + 2
-                    current_line = word
-
-            if current_line:
-                rendered = font.render(current_line, True, color)
-                self.screen.blit(rendered, (x, y + offset))
-                offset += rendered.get_height() + 2
-
-            offset += font.get_height() // 2  # extra gap for manual newline
-
-        return offset  # total drawn height, though not used yet
-
     def __init__(self, x, y, width, height, font=None,
                  text_color=(200, 255, 200), bg_color=(30, 30, 30)):
         self.rect = pygame.Rect(x, y, width, height)
         self.font = font or pygame.font.SysFont("consolas", 20)
         self.text_color = text_color
         self.bg_color = bg_color
-        self.text = ""
+        self._bg_surf = pygame.Surface(self.rect.size).convert()
+        self._bg_surf.fill(bg_color)
+        # Typed characters; joined lazily by get_text() so input stays linear
+        self._chars = []
+        self._text = ""
         self.caret_visible = True
         self.last_blink = pygame.time.get_ticks()
+        self._saved_repeat = None
+        # Rendered lines, text metrics and layout; only valid for the current text
+        self._render_cache = {}
+        self._size_cache = {}
+        self._wrap_cache = {}
+
+    def _render(self, font, text, color):
+        key = (font, text, color)
+        surf = self._render_cache.get(key)
+        if surf is None:
+            # Match the display format so blitting doesn't convert pixels every frame
+            surf = self._render_cache[key] = font.render(text, True, color).convert_alpha()
+        return surf
+
+    def _size(self, font, text):
+        key = (font, text)
+        size = self._size_cache.get(key)
+        if size is None:
+            size = self._size_cache[key] = font.size(text)
+        return size
+
+    def _invalidate(self):
+        self._text = None
+        self._render_cache.clear()
+        self._size_cache.clear()
+        self._wrap_cache.clear()
+
+    def activate(self):
+        """Start typed-text events and key repeat; call deactivate() when leaving the scene."""
+        self._saved_repeat = pygame.key.get_repeat()
+        pygame.key.start_text_input()
+        pygame.key.set_repeat(400, 30)
+
+    def deactivate(self):
+        """Undo activate(), leaving the app's input state as it was."""
+        pygame.key.stop_text_input()
+        if self._saved_repeat is not None:
+            pygame.key.set_repeat(*self._saved_repeat)
+            self._saved_repeat = None
 
     def handle_event(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_RETURN:
-                self.text += "\n"
-            elif event.key == pygame.K_BACKSPACE:
-                self.text = self.text[:-1]
-            else:
-                self.text += event.unicode
+        """Apply a keyboard event. Returns True if the text changed."""
+        # Characters arrive as TEXTINPUT (which also handles IME composition);
+        # KEYDOWN is only needed for the editing keys
+        if event.type == pygame.TEXTINPUT:
+            self._chars.extend(event.text)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+            self._chars.append("\n")
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+            # SDL sends no TEXTINPUT for tab
+            self._chars.append("\t")
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE and self._chars:
+            self._chars.pop()
+        else:
+            return False
+        self._invalidate()
+        return True
+
+    def update(self):
+        """Advance the caret blink. Returns True if the box needs redrawing."""
+        now = pygame.time.get_ticks()
+        if now - self.last_blink >= self.CARET_BLINK_INTERVAL:
+            self.caret_visible = not self.caret_visible
+            self.last_blink = now
+            return True
+        return False
 
     def draw(self, screen, surface):
-        self.screen = screen
-        pygame.draw.rect(surface, self.bg_color, self.rect)
+        surface.blit(self._bg_surf, self.rect.topleft)
 
         # Draw the text
-        paragraphs = self.text.split("\n")
         x, y = self.rect.x + 10, self.rect.y + 10
-        caret_x, caret_y = x, y
+        placements, (caret_dx, caret_dy) = self._wrap(self.get_text(), self.rect.width - 20)
+        surface.blits([(rendered, (x + dx, y + dy)) for rendered, (dx, dy) in placements], doreturn=False)
+
+        if self.caret_visible:
+            caret_x, caret_y = x + caret_dx, y + caret_dy
+            caret_height = self.font.get_height()
+            pygame.draw.line(surface, self.text_color,
+                             (caret_x, caret_y),
+                             (caret_x, caret_y + caret_height), 2)
+
+    def _wrap(self, text, max_width):
+        """
+        Lay out the text as (surface, (dx, dy)) placements relative to the
+        text origin, plus the caret offset at the end of the last line.
+        Cached until the text changes.
+        """
+        key = (text, max_width)
+        layout = self._wrap_cache.get(key)
+        if layout is not None:
+            return layout
+
+        placements = []
+        y = 0
+        caret_x, caret_y = 0, 0
         line_height = self.font.get_height() + 2
 
-        for paragraph in paragraphs:
+        for paragraph in text.split("\n"):
             words = paragraph.split(" ")
             current_line = ""
             for word in words:
                 test_line = current_line + ("" if current_line == "" else " ") + word
-                if self.font.size(test_line)[0] <= (self.rect.width - 20):
+                if self._size(self.font, test_line)[0] <= max_width:
                     current_line = test_line
                 else:
-                    surface.blit(self.font.render(current_line, True, self.text_color), (x, y))
+                    placements.append((self._render(self.font, current_line, self.text_color), (0, y)))
                     y += line_height
                     current_line = word
-            surface.blit(self.font.render(current_line, True, self.text_color), (x, y))
+            placements.append((self._render(self.font, current_line, self.text_color), (0, y)))
             # Update caret position to end of last rendered line
-            caret_x = x + self.font.size(current_line)[0]
+            caret_x = self._size(self.font, current_line)[0]
             caret_y = y
             y += line_height
 
-        # Blinking caret logic
-        now = pygame.time.get_ticks()
-        if now - self.last_blink >= self.CARET_BLINK_INTERVAL:
-            self.caret_visible = not self.caret_visible
-            self.last_blink = now
-
-        if self.caret_visible:
-            caret_height = self.font.get_height()
-            pygame.draw.line(surface, self.text_color,
-                             (caret_x, caret_y),
-                             (caret_x, caret_y + caret_height), 2)
+        layout = self._wrap_cache[key] = (placements, (caret_x, caret_y))
+        return layout
 
     def get_text(self):
-        return self.text
+        if self._text is None:
+            self._text = "".join(self._chars)
+        return self._text
 
     def set_text(self, new_text):
-        self.text = new_text
+        self._chars = list(new_text)
+        self._invalidate()
@@ -4,7 +4,39 @@ import os
 
 class TextScene(object):
 
-    def draw_multiline(self, text, default_color, x, y, max_width=1100, font=None, bold_color=(255, 255, 255)):
+    def __init__(self, screen):
+        self.screen = screen
+        # Rendered text surfaces and text metrics, keyed by what produced them.
+        # Most of what we draw is static, so steady-state frames hit these only.
+        self._render_cache = {}
+        self._size_cache = {}
+        self._wrap_cache = {}
+        # Bold fonts for inline emphasis, keyed by size; SysFont lookups are slow
+        self._bold_fonts = {}
+
+    def _bold_for(self, font):
+        size = font.get_height()
+        bold_font = self._bold_fonts.get(size)
+        if bold_font is None:
+            bold_font = self._bold_fonts[size] = pygame.font.SysFont("consolas", size, bold=True)
+        return bold_font
+
+    def _render(self, font, text, color):
+        key = (font, text, color)
+        surf = self._render_cache.get(key)
+        if surf is None:
+            # Match the display format so blitting doesn't convert pixels every frame
+            surf = self._render_cache[key] = font.render(text, True, color).convert_alpha()
+        return surf
+
+    def _size(self, font, text):
+        key = (font, text)
+        size = self._size_cache.get(key)
+        if size is None:
+            size = self._size_cache[key] = font.size(text)
+        return size
+
+    def draw_multiline(self, text, default_color, x, y, max_width=1100, font=None, bold_color=(255, 255, 255), surface=None):
         '''
             Render multi-line text with word wrapping, manual newline support, and inline bold styling.
 
@@ -14,13 +46,41 @@ class TextScene(object):
             bold with a specified highlight colour, allowing inline emphasis (e.g.,
             *table_name*). Bold mode can span multiple words and will toggle on or off
             whenever an asterisk is encountered.
+
+            Draws onto ``surface`` (the screen by default) and returns the total
+            height drawn.
         '''
 
         if font is None:
             font = self.font
+        if surface is None:
+            surface = self.screen
+
+        placements, height = self._wrap(text, font, max_width, default_color, bold_color)
+        surface.blits([(rendered, (x + dx, y + dy)) for rendered, (dx, dy) in placements], doreturn=False)
 
-        bold_font = pygame.font.SysFont("consolas", font.get_height(), bold=True)
+        return height
 
+    def _wrap(self, text, font, max_width, default_color, bold_color):
+        '''
+            Lay out text for draw_multiline. Returns a list of (surface, (dx, dy))
+            placements relative to the top-left corner, and the total height.
+            Layouts are cached, so unchanged text is only wrapped once.
+        '''
+        key = (text, font, max_width, default_color, bold_color)
+        layout = self._wrap_cache.get(key)
+        if layout is not None:
+            return layout
+
+        bold_font = self._bold_for(font)
+
+        # Metrics that don't change while laying out this block
+        space_w_regular = self._size(font, " ")[0]
+        space_w_bold = self._size(bold_font, " ")[0]
+        line_h = font.get_height() + 2
+        paragraph_gap = font.get_height() // 2
+
+        placements = []
         paragraphs = text.split("\n")
         offset = 0
 
@@ -45,28 +105,32 @@ class TextScene(object):
                     parts = [(word, bold_color, bold_font)] if bold_mode else [(word, default_color, font)]
 
                 for text_part, color, use_font in parts:
-                    test_width = line_width + use_font.size(text_part + " ")[0]
-                    if test_width > max_width and line_width > 0:
-                        # Render current line before wrapping
-                        x_offset = x
-                        for t, c, fnt in current_line_parts:
-                            rendered = fnt.render(t, True, c)
-                            self.screen.blit(rendered, (x_offset, y + offset))
-                            x_offset += rendered.get_width() + fnt.size(" ")[0]
-                        offset += font.get_height() + 2
+                    bold = use_font is bold_font
+                    part_width = self._size(use_font, text_part)[0] + (space_w_bold if bold else space_w_regular)
+                    if line_width + part_width > max_width and line_width > 0:
+                        # Lay out current line before wrapping
+                        x_offset = 0
+                        for t, c, fnt, b in current_line_parts:
+                            rendered = self._render(fnt, t, c)
+                            placements.append((rendered, (x_offset, offset)))
+                            x_offset += rendered.get_width() + (space_w_bold if b else space_w_regular)
+                        offset += line_h
                         current_line_parts = []
                         line_width = 0
 
-                    current_line_parts.append((text_part, color, use_font))
-                    line_width += use_font.size(text_part + " ")[0]
+                    current_line_parts.append((text_part, color, use_font, bold))
+                    line_width += part_width
 
-            # Render last line of paragraph
+            # Lay out last line of paragraph
             if current_line_parts:
-                x_offset = x
-                for t, c, fnt in current_line_parts:
-                    rendered = fnt.render(t, True, c)
-                    self.screen.blit(rendered, (x_offset, y + offset))
-                    x_offset += rendered.get_width() + fnt.size(" ")[0]
-                offset += font.get_height() + 2
-
-            offset += font.get_height() // 2  # extra gap for manual newline
+                x_offset = 0
+                for t, c, fnt, b in current_line_parts:
+                    rendered = self._render(fnt, t, c)
+                    placements.append((rendered, (x_offset, offset)))
+                    x_offset += rendered.get_width() + (space_w_bold if b else space_w_regular)
+                offset += line_h
+
+            offset += paragraph_gap  # extra gap for manual newline
+
+        layout = self._wrap_cache[key] = (placements, offset)
+        return layout
@@ -0,0 +1,50 @@
+import sqlite3
+import unittest
+from types import SimpleNamespace
+
+from src.scenes.level import Level, RESULT_PREVIEW_ROWS
+
+
+def make_level(player_sql, solution_sql, conn):
+    # check_sql only needs these attributes, so skip __init__ and its pygame setup
+    level = Level.__new__(Level)
+    level._example_conn = conn
+    level.sql_box = SimpleNamespace(get_text=lambda: player_sql)
+    level.meta = {"solution_sql": solution_sql}
+    level.level_id = None
+    level.set_solved = lambda: None
+    return level
+
+
+class CheckSqlPreviewTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:", isolation_level=None)
+        self.conn.execute("CREATE TABLE t (x INTEGER)")
+        self.conn.executemany("INSERT INTO t VALUES (?)", ((i,) for i in range(RESULT_PREVIEW_ROWS + 11)))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def preview(self, player_sql):
+        level = make_level(player_sql, "SELECT x FROM t ORDER BY x", self.conn)
+        level.check_sql()
+        return level.result_text
+
+    def test_mismatch_after_preview_rows_is_marked_truncated(self):
+        # The player's rows all match but one short, so the mismatch is the last row
+        result = self.preview(f"SELECT x FROM t WHERE x < {RESULT_PREVIEW_ROWS + 10} ORDER BY x")
+        self.assertTrue(result.startswith("❌ Incorrect."))
+        self.assertIn(f"({RESULT_PREVIEW_ROWS - 1},)", result)
+        self.assertNotIn(f"({RESULT_PREVIEW_ROWS},)", result)
+        self.assertTrue(result.endswith(" ..."))
+
+    def test_short_wrong_result_is_not_marked_truncated(self):
+        result = self.preview("SELECT x + 1 FROM t WHERE x < 3 ORDER BY x")
+        self.assertTrue(result.endswith("[(1,), (2,), (3,)]"))
+
+    def test_correct_result(self):
+        self.assertEqual(self.preview("SELECT x FROM t ORDER BY x"), "✅ Correct!")
+
+
+if __name__ == "__main__":
+    unittest.main()
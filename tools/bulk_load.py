@@ -0,0 +1,12 @@
+''' sqlite settings shared by the tools that fill the shipped databases '''
+
+def tune_for_bulk_load(conn):
+    ''' pragmas that let a one-off load run without an fsync per commit '''
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA cache_size = -65536;")
+
+def finish_bulk_load(conn):
+    ''' undoes the WAL switch: the file is shipped with the game, so leave it as a single file '''
+    conn.execute("PRAGMA journal_mode = DELETE;")
@@ -3,6 +3,10 @@
 import sqlite3
 from pathlib import Path
 import csv
+from itertools import chain, islice
+from operator import itemgetter
+
+from bulk_load import tune_for_bulk_load, finish_bulk_load
 
 DB_PATH = Path("data/level1_example.sqlite")
 
@@ -12,23 +16,40 @@ CARGO_CSV_PATH = Path("data/cargo.csv")
 LOG_CSV_PATH = Path("data/log.csv")
 PLANET_CSV_PATH = Path("data/planet.csv")
 
-def create_table():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-
-    # Enable foreign key constraints
-    cur.execute("PRAGMA foreign_keys = ON;")
+# (table, csv path, columns) in load order, parents before children
+TABLES = (
+    ("Planet", PLANET_CSV_PATH, ("id", "name", "mass", "status")),
+    ("Vessel", VESSEL_CSV_PATH, ("id", "name", "captain", "type", "flag")),
+    ("Passenger", PASSENGER_CSV_PATH, ("name", "type", "nationality", "vessel")),
+    ("Log", LOG_CSV_PATH, ("id", "port", "arrival", "departure", "vessel")),
+    ("Cargo", CARGO_CSV_PATH, ("id", "description", "category", "weight", "hazardous", "consignee", "consignor", "vessel")),
+)
+
+# SQLite's default cap on bound parameters per statement (older builds)
+MAX_PARAMS = 999
+
+# (table, column) pairs indexed once the data is in, rather than maintained row by row
+INDEXES = (
+    ("Vessel", "flag"),
+    ("Passenger", "nationality"),
+    ("Passenger", "vessel"),
+    ("Log", "port"),
+    ("Log", "vessel"),
+    ("Cargo", "vessel"),
+)
+
+def create_table(conn):
+    # One script, one transaction for all the DDL
+    conn.executescript("""
+        BEGIN IMMEDIATE;
 
-    cur.execute("""
         CREATE TABLE IF NOT EXISTS Planet (
             id INTEGER PRIMARY KEY,
             name VARCHAR,
             mass FLOAT,
             status VARCHAR
-        )
-    """)
+        );
 
-    cur.execute("""
         CREATE TABLE IF NOT EXISTS Vessel (
             id INTEGER PRIMARY KEY,
             name VARCHAR,
@@ -36,10 +57,8 @@ def create_table():
             type VARCHAR,
             flag INTEGER,
             FOREIGN KEY (flag) REFERENCES Planet(id)
-        )
-    """)
+        );
 
-    cur.execute("""
         CREATE TABLE IF NOT EXISTS Passenger (
             name VARCHAR PRIMARY KEY,
             type VARCHAR,
@@ -47,10 +66,8 @@ def create_table():
             vessel INTEGER,
             FOREIGN KEY (nationality) REFERENCES Planet(id),
             FOREIGN KEY (vessel) REFERENCES Vessel(id)
-        )
-    """)
+        );
 
-    cur.execute("""
         CREATE TABLE IF NOT EXISTS Log (
             id INTEGER PRIMARY KEY,
             port INTEGER,
@@ -59,10 +76,8 @@ def create_table():
             vessel INTEGER,
             FOREIGN KEY (port) REFERENCES Planet(id),
             FOREIGN KEY (vessel) REFERENCES Vessel(id)
-        )
-    """)
+        );
 
-    cur.execute("""
         CREATE TABLE IF NOT EXISTS Cargo (
             id INTEGER PRIMARY KEY,
             description VARCHAR,
@@ -73,62 +88,84 @@ def create_table():
             consignor VARCHAR,
             vessel INTEGER,
             FOREIGN KEY (vessel) REFERENCES Vessel(id)
-        )
-    """)
+        );
 
-    conn.commit()
-    conn.close()
+        COMMIT;
+    """)
     print(f"Level table created in {DB_PATH}")
 
-def insert_from_csv():
+def read_rows(f, columns):
+    ''' yields plain tuples of the given columns from an open CSV file, in that order '''
+    # csv.reader gives blank lines as empty rows; skip them as DictReader did
+    reader = filter(None, csv.reader(f))
+    header = next(reader, [])
+    # Column affinity converts the numeric strings, so no casting is needed here
+    if tuple(header) == columns:
+        # Already in table order (the generators write it that way), so the
+        # reader's rows can be bound as they are
+        return reader
+
+    missing = [c for c in columns if c not in header]
+    if not missing:
+        return map(itemgetter(*(header.index(c) for c in columns)), reader)
+
+    # Columns the file doesn't have are loaded as NULL
+    print(f"{f.name} is missing column(s) {', '.join(missing)}; loading them as NULL")
+    positions = [header.index(c) if c in header else None for c in columns]
+    return (tuple(None if i is None else row[i] for i in positions) for row in reader)
+
+def insert_batched(cur, table, columns, rows):
+    ''' inserts rows with multi-row INSERT ... VALUES (...), (...) statements '''
+    batch_size = MAX_PARAMS // len(columns)
+    row_sql = f"({', '.join('?' * len(columns))})"
+    insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+    # Every full batch reuses the same text, so sqlite3's statement cache keeps it prepared
+    full_batch_sql = insert_sql + ", ".join([row_sql] * batch_size)
+
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        sql = full_batch_sql if len(batch) == batch_size else insert_sql + ", ".join([row_sql] * len(batch))
+        cur.execute(sql, tuple(chain.from_iterable(batch)))
+
+def insert_from_csv(conn):
     ''' reads all the CSVs and loads them into the tables '''
-    conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
 
-    # Planet
-    with open(PLANET_CSV_PATH, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        cur.executemany("""
-            INSERT INTO Planet (id, name, mass, status)
-            VALUES (:id, :name, :mass, :status)
-        """, reader)
-
-    # Vessel
-    with open(VESSEL_CSV_PATH, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        cur.executemany("""
-            INSERT INTO Vessel (id, name, captain, type, flag)
-            VALUES (:id, :name, :captain, :type, :flag)
-        """, reader)
-
-    # Passenger
-    with open(PASSENGER_CSV_PATH, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        cur.executemany("""
-            INSERT INTO Passenger (name, type, nationality, vessel)
-            VALUES (:name, :type, :nationality, :vessel)
-        """, reader)
-
-    # Log
-    with open(LOG_CSV_PATH, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        cur.executemany("""
-            INSERT INTO Log (id, port, arrival, departure, vessel)
-            VALUES (:id, :port, :arrival, :departure, :vessel)
-        """, reader)
-
-    # Cargo
-    with open(CARGO_CSV_PATH, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        cur.executemany("""
-            INSERT INTO Cargo (id, description, category, weight, hazardous, consignee, consignor, vessel)
-            VALUES (:id, :description, :category, :weight, :hazardous, :consignee, :consignor, :vessel)
-        """, reader)
-
-    conn.commit()
-    conn.close()
+    # Nothing in the CSVs needs checking, so skip the parent lookup on every insert
+    cur.execute("PRAGMA foreign_keys = OFF;")
+
+    # One transaction for everything, taking the write lock up front
+    cur.execute("BEGIN IMMEDIATE")
+
+    for table, path, columns in TABLES:
+        with open(path, newline='', encoding='utf-8') as f:
+            insert_batched(cur, table, columns, read_rows(f, columns))
+
+    cur.execute("COMMIT")
     print("CSV data inserted into database.")
 
+def create_indexes(conn):
+    ''' indexes the foreign key columns, run after insert_from_csv '''
+    cur = conn.cursor()
+
+    cur.execute("BEGIN IMMEDIATE")
+    for table, column in INDEXES:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_{column} ON {table} ({column})")
+    cur.execute("COMMIT")
+    print(f"Created {len(INDEXES)} indexes in {DB_PATH}")
+
+def main():
+    # One connection for the whole build. isolation_level=None: every
+    # transaction is managed by hand
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    tune_for_bulk_load(conn)
+
+    create_table(conn)
+    insert_from_csv(conn)
+    create_indexes(conn)
+
+    finish_bulk_load(conn)
+    conn.close()
+
 if __name__ == "__main__":
-    create_table()
-    insert_from_csv()
+    main()
@@ -4,6 +4,8 @@ import sqlite3
 from pathlib import Path
 import csv
 
+from bulk_load import tune_for_bulk_load, finish_bulk_load
+
 DB_PATH = Path("data/level_meta.sqlite")
 CSV_PATH = Path("data/level_meta.csv")
 
@@ -31,12 +33,15 @@ def insert_from_csv():
         print(f"CSV file not found: {CSV_PATH}")
         return
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    tune_for_bulk_load(conn)
     cur = conn.cursor()
 
+    cur.execute("BEGIN IMMEDIATE")
     with open(CSV_PATH, newline='', encoding='utf-8') as csvfile:
         reader = csv.DictReader(csvfile)
-        rows = [
+        # A generator: rows go straight from the CSV into SQLite without a list in between
+        rows = (
             (
                 int(row["id"]),
                 row["title"],
@@ -46,17 +51,19 @@ def insert_from_csv():
                 row.get("solved", "0") in ("1", "true", "True")
             )
             for row in reader
-        ]
+        )
 
-    cur.executemany("""
-        INSERT OR REPLACE INTO Level
-        (id, title, pretext, posttext, solution_sql, solved)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, rows)
+        cur.executemany("""
+            INSERT OR REPLACE INTO Level
+            (id, title, pretext, posttext, solution_sql, solved)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+        inserted = cur.rowcount
+    cur.execute("COMMIT")
 
-    conn.commit()
+    finish_bulk_load(conn)
     conn.close()
-    print(f"Inserted {len(rows)} rows from {CSV_PATH} into {DB_PATH}")
+    print(f"Inserted {inserted} rows from {CSV_PATH} into {DB_PATH}")
 
 if __name__ == "__main__":
     create_table()
@@ -0,0 +1,5 @@
+''' file settings shared by the scripts that read and write the data CSVs '''
+
+# csv issues many small reads/writes; larger buffers mean far fewer syscalls
+READ_BUFFER = 256 * 1024
+WRITE_BUFFER = 1024 * 1024
@@ -4,9 +4,11 @@ Generate a cargo.csv from an existing vessels CSV.
 
 Reads:
   - data/vessel.csv   (id,name,captain,type,flag)
+    or, with --sqlite, the Vessel table of that database
 
 Writes:
   - data/cargo.csv    (id,description,category,weight,hazardous,consignee,consignor,vessel)
+    or, with --sqlite, the Cargo table of an existing level database
 
 Design notes (thought-through):
   - Number of cargo rows per vessel depends on vessel type (tankers have few heavy loads,
@@ -20,16 +22,28 @@ Design notes (thought-through):
     or expand generated manifests.
 Usage:
     python tools/generate_cargo.py --seed 7 --scale 1.0 --out data/cargo.csv
+    python tools/generate_cargo.py --seed 7 --sqlite data/level1_example.sqlite   (vessels read from the DB)
 """
 
 from pathlib import Path
 import csv
 import random
+import sqlite3
 import argparse
+from collections import namedtuple
+from functools import lru_cache
+from itertools import accumulate, chain, repeat
+
+from bulk_load import tune_for_bulk_load, finish_bulk_load
 
 VESSEL_CSV = Path("data/vessel.csv")
 OUT_CSV = Path("data/cargo.csv")
 
+# One record per vessel; canon is the canonical type, resolved once at load
+Vessel = namedtuple("Vessel", "id name captain type_raw flag canon")
+
+CARGO_COLUMNS = ("id", "description", "category", "weight", "hazardous", "consignee", "consignor", "vessel")
+
 # Map rough vessel types (substring matching) to canonical types and cargo profiles
 TYPE_MAP = {
     "passenger liner": ["passenger liner", "liner", "passenger"],
@@ -278,6 +292,34 @@ CATEGORY_WEIGHTS_BY_TYPE = {
     ],
 }
 
+
+def category_table(items_with_weights):
+    categories, weights = zip(*items_with_weights)
+    return categories, tuple(accumulate(weights))
+
+
+# The same weightings as cumulative tables, built once so that a vessel's whole
+# manifest is a single choices call (a bisect per draw, no re-summing)
+DEFAULT_CATEGORY_TABLE = category_table(DEFAULT_CATEGORY_WEIGHTS)
+CATEGORY_TABLES = {canon: category_table(weights) for canon, weights in CATEGORY_WEIGHTS_BY_TYPE.items()}
+
+
+def category_params(cat_def):
+    qty_lo, qty_hi = cat_def["qty_range"]
+    uw_lo, uw_hi = cat_def["unit_weight_range"]
+    return (
+        qty_lo, max(qty_lo, qty_hi), uw_lo, uw_hi,
+        cat_def.get("hazard_prob", 0.0), cat_def.get("always_hazard", False),
+        # "{qty} crates of X" -> ("", " crates of X"), so no format string is parsed per line
+        tuple(tuple(t.split("{qty}")) for t in cat_def["templates"]),
+    )
+
+
+# CATEGORY_DEFS flattened to one tuple per category:
+# (qty_lo, qty_hi, unit_weight_lo, unit_weight_hi, hazard_prob, always_hazard, split templates)
+# so each manifest line is tuple unpacking and arithmetic, not dict lookups
+CATEGORY_PARAMS = {category: category_params(cat_def) for category, cat_def in CATEGORY_DEFS.items()}
+
 # Company and person pools for consignee/consignor generation
 COMPANIES = [
     "AstraCorp Logistics", "Nova Traders", "Zenith Freight", "Orbital Freight Ltd",
@@ -295,34 +337,84 @@ SURNAMES = [
     "Haddad", "Nakamura", "Silva", "Novak", "Rossi", "Patel", "Dubois", "Iversen"
 ]
 
+# Every "first last" combination, built once so picking a person is one choice
+# and no new string per manifest line
+ALL_INDIVIDUALS = tuple(f"{fn} {sn}" for fn in FIRST_NAMES for sn in SURNAMES)
+
+# Companies and people in one pool; the cumulative weights carry the company/person
+# split, so a whole vessel's consignees (or consignors) are a single choices call
+PARTIES = tuple(COMPANIES) + ALL_INDIVIDUALS
+
+
+def party_cum_weights(company_share):
+    company_w = company_share / len(COMPANIES)
+    person_w = (1 - company_share) / len(ALL_INDIVIDUALS)
+    return tuple(accumulate([company_w] * len(COMPANIES) + [person_w] * len(ALL_INDIVIDUALS)))
+
+
+# 60% company, 40% individual
+CONSIGNEE_CUM_WEIGHTS = party_cum_weights(0.6)
+# 50% company, 50% individual
+CONSIGNOR_CUM_WEIGHTS = party_cum_weights(0.5)
+
 
 def parse_args():
     p = argparse.ArgumentParser(description="Generate cargo.csv using vessel.csv.")
-    p.add_argument("--vessels", type=Path, default=VESSEL_CSV, help="Path to vessel.csv")
+    p.add_argument("--vessels", type=Path, default=None, help="Path to vessel.csv (default: data/vessel.csv, or the Vessel table with --sqlite)")
     p.add_argument("--out", type=Path, default=OUT_CSV, help="Output path for cargo.csv")
     p.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility")
     p.add_argument("--scale", type=float, default=1.0, help="Scale overall cargo counts (e.g., 0.5 halves lines)")
+    p.add_argument("--sqlite", type=Path, default=None, help="Insert into the Cargo table of this database instead of writing a CSV")
     return p.parse_args()
 
 
 def load_vessels(path: Path):
     with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        col = {name: i for i, name in enumerate(next(reader, []))}
+        # A CSV without name, captain, type or flag still loads, with "" and 0 in their place
+        id_i = col["id"]
+        name_i, captain_i, type_i, flag_i = (col.get(c) for c in ("name", "captain", "type", "flag"))
         vessels = []
         for row in reader:
-            vessels.append({
-                "id": int(row["id"]),
-                "name": row.get("name", "").strip(),
-                "captain": row.get("captain", "").strip(),
-                "type_raw": row.get("type", "").strip().lower(),
-                "flag": int(row.get("flag", 0)),
-            })
+            type_raw = row[type_i].strip().lower() if type_i is not None else ""
+            vessels.append(Vessel(
+                int(row[id_i]),
+                row[name_i].strip() if name_i is not None else "",
+                row[captain_i].strip() if captain_i is not None else "",
+                type_raw,
+                int(row[flag_i]) if flag_i is not None else 0,
+                canonical_type(type_raw),
+            ))
     if not vessels:
         raise ValueError("No vessels found in vessels CSV")
     return vessels
 
 
+def load_vessels_from_db(db_path: Path):
+    # Same shape as load_vessels, read from a level database's Vessel table
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT id, name, captain, type, flag FROM Vessel ORDER BY id").fetchall()
+    conn.close()
+    vessels = []
+    for vid, name, captain, type_raw, flag in rows:
+        type_raw = (type_raw or "").strip().lower()
+        vessels.append(Vessel(
+            vid,
+            (name or "").strip(),
+            (captain or "").strip(),
+            type_raw,
+            flag or 0,
+            canonical_type(type_raw),
+        ))
+    if not vessels:
+        raise ValueError(f"No vessels found in {db_path}")
+    return vessels
+
+
+@lru_cache(maxsize=None)
 def canonical_type(type_raw: str) -> str:
+    # Fleets repeat a handful of type strings, so each is only scanned once
     type_raw = (type_raw or "").lower()
     for canon, tokens in TYPE_MAP.items():
         for t in tokens:
@@ -331,125 +423,114 @@ def canonical_type(type_raw: str) -> str:
     return "unknown"
 
 
-def weighted_choice(items_with_weights):
-    total = sum(w for _, w in items_with_weights)
-    r = random.uniform(0, total)
-    acc = 0.0
-    for it, w in items_with_weights:
-        acc += w
-        if r <= acc:
-            return it
-    return items_with_weights[-1][0]
-
-
-def pick_category_for_vessel(canon_type):
-    if canon_type in CATEGORY_WEIGHTS_BY_TYPE:
-        weights = CATEGORY_WEIGHTS_BY_TYPE[canon_type]
-    else:
-        weights = DEFAULT_CATEGORY_WEIGHTS
-    # convert to list of (category, weight)
-    return weighted_choice(weights)
-
-
-def choose_quantity_for_category(cat_def):
-    lo, hi = cat_def["qty_range"]
-    return random.randint(lo, max(lo, hi))
-
-
-def choose_unit_weight_for_category(cat_def):
-    lo, hi = cat_def["unit_weight_range"]
-    return random.uniform(lo, hi)
-
-
-def make_description(template, qty):
-    return template.format(qty=qty)
-
-
-def make_consignee():
-    # 60% company, 40% individual
-    if random.random() < 0.6:
-        return random.choice(COMPANIES)
-    else:
-        return f"{random.choice(FIRST_NAMES)} {random.choice(SURNAMES)}"
-
-
-def make_consignor():
-    # 50% company, 50% individual
-    if random.random() < 0.5:
-        return random.choice(COMPANIES)
-    else:
-        return f"{random.choice(FIRST_NAMES)} {random.choice(SURNAMES)}"
-
-
-def generate_cargo(vessels, out_path: Path, seed=None, scale: float = 1.0):
-    if seed is not None:
-        random.seed(seed)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    cargo_rows = []
+def iter_cargo(rng, vessels, scale: float = 1.0):
+    # Yields one list of row tuples (CARGO_COLUMNS order) per vessel. Each vessel's
+    # lines are built column by column and zipped into rows in one go.
     cid = 1
 
     for v in vessels:
-        canon = canonical_type(v["type_raw"])
+        canon = v.canon
         lo, hi = VESSEL_CARGO_COUNTS.get(canon, VESSEL_CARGO_COUNTS["unknown"])
         # scale the counts but ensure at least 1 line for every vessel
         lo_s = max(1, int(round(lo * scale)))
         hi_s = max(lo_s, int(round(hi * scale)))
-        n_items = random.randint(lo_s, hi_s)
-
-        for _ in range(n_items):
-            category = pick_category_for_vessel(canon)
-            cat_def = CATEGORY_DEFS.get(category, None)
-            if cat_def is None:
+        n_items = rng.randint(lo_s, hi_s)
+
+        # Everything that doesn't depend on the line's category is drawn per vessel
+        categories, cum_weights = CATEGORY_TABLES.get(canon, DEFAULT_CATEGORY_TABLE)
+        drawn = rng.choices(categories, cum_weights=cum_weights, k=n_items)
+        consignees = rng.choices(PARTIES, cum_weights=CONSIGNEE_CUM_WEIGHTS, k=n_items)
+        consignors = rng.choices(PARTIES, cum_weights=CONSIGNOR_CUM_WEIGHTS, k=n_items)
+
+        line_categories = []
+        descriptions = []
+        weights = []
+        hazards = []
+        for category in drawn:
+            params = CATEGORY_PARAMS.get(category, None)
+            if params is None:
                 # fallback
                 category = "Spare Parts"
-                cat_def = CATEGORY_DEFS[category]
+                params = CATEGORY_PARAMS[category]
+            qty_lo, qty_hi, uw_lo, uw_hi, hazard_prob, always_hazard, templates = params
 
-            qty = choose_quantity_for_category(cat_def)
-            unit_w = choose_unit_weight_for_category(cat_def)
+            qty = rng.randint(qty_lo, qty_hi)
             # weight is qty * unit weight, round to 3 decimals
-            weight = round(qty * unit_w, 3)
+            weight = round(qty * rng.uniform(uw_lo, uw_hi), 3)
 
             # description template selection
-            template = random.choice(cat_def["templates"])
-            description = make_description(template, qty)
+            prefix, suffix = rng.choice(templates)
+            description = f"{prefix}{qty}{suffix}"
 
             # hazardous decision
-            if cat_def.get("always_hazard", False):
+            if always_hazard:
                 hazardous = 1
             else:
-                hazardous = 1 if random.random() < cat_def.get("hazard_prob", 0.0) else 0
-
-            consignee = make_consignee()
-            consignor = make_consignor()
-
-            cargo_rows.append({
-                "id": cid,
-                "description": description,
-                "category": category,
-                "weight": weight,
-                "hazardous": hazardous,
-                "consignee": consignee,
-                "consignor": consignor,
-                "vessel": v["id"],
-            })
-            cid += 1
-
-    # write CSV
+                hazardous = 1 if rng.random() < hazard_prob else 0
+
+            line_categories.append(category)
+            descriptions.append(description)
+            weights.append(weight)
+            hazards.append(hazardous)
+
+        yield list(zip(
+            range(cid, cid + n_items), descriptions, line_categories, weights, hazards,
+            consignees, consignors, repeat(v.id, n_items),
+        ))
+        cid += n_items
+
+
+def generate_cargo(vessels, out_path: Path, seed=None, scale: float = 1.0):
+    rng = random.Random(seed)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Rows are written a vessel at a time, so memory doesn't grow with the output
+    count = 0
     with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["id", "description", "category", "weight", "hazardous", "consignee", "consignor", "vessel"])
-        writer.writeheader()
-        writer.writerows(cargo_rows)
+        writer = csv.writer(f)
+        writer.writerow(CARGO_COLUMNS)
+        for rows in iter_cargo(rng, vessels, scale):
+            writer.writerows(rows)
+            count += len(rows)
 
-    print(f"Wrote {len(cargo_rows)} cargo rows to {out_path} for {len(vessels)} vessels.")
+    print(f"Wrote {count} cargo rows to {out_path} for {len(vessels)} vessels.")
+
+
+def generate_cargo_sqlite(vessels, db_path: Path, seed=None, scale: float = 1.0):
+    # Inserts straight into an existing Cargo table (see create_level_data.py),
+    # replacing its contents, with no cargo.csv in between
+    rng = random.Random(seed)
+
+    # isolation_level=None: the DELETE and the inserts share the one transaction below
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    tune_for_bulk_load(conn)
+    cur = conn.cursor()
+
+    cur.execute("BEGIN IMMEDIATE")
+    cur.execute("DELETE FROM Cargo")
+    cur.executemany(
+        f"INSERT INTO Cargo ({', '.join(CARGO_COLUMNS)}) VALUES ({', '.join('?' * len(CARGO_COLUMNS))})",
+        chain.from_iterable(iter_cargo(rng, vessels, scale)),
+    )
+    count = cur.rowcount
+    cur.execute("COMMIT")
+
+    finish_bulk_load(conn)
+    conn.close()
+    print(f"Wrote {count} cargo rows to {db_path} for {len(vessels)} vessels.")
 
 
 def main():
     args = parse_args()
-    if args.seed is not None:
-        random.seed(args.seed)
-    vessels = load_vessels(args.vessels)
-    generate_cargo(vessels, args.out, seed=args.seed, scale=args.scale)
+    if args.vessels is None and args.sqlite is not None:
+        # The vessels are already in the database being filled, so skip the CSV
+        vessels = load_vessels_from_db(args.sqlite)
+    else:
+        vessels = load_vessels(args.vessels or VESSEL_CSV)
+    if args.sqlite is not None:
+        generate_cargo_sqlite(vessels, args.sqlite, seed=args.seed, scale=args.scale)
+    else:
+        generate_cargo(vessels, args.out, seed=args.seed, scale=args.scale)
 
 
 if __name__ == "__main__":
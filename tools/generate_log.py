@@ -25,11 +25,22 @@ from pathlib import Path
 import csv
 import random
 import argparse
-from datetime import datetime, timezone, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from collections import namedtuple
+from itertools import chain
+from datetime import datetime, timezone
+
+from csv_io import READ_BUFFER, WRITE_BUFFER
+from sampling import alias_choice, build_alias_table
 
 PLANET_CSV = Path("data/planet.csv")
 VESSEL_CSV = Path("data/vessel.csv")
 OUT_CSV = Path("data/log.csv")
+LOG_COLUMNS = ("id", "port", "arrival", "departure", "vessel")
+
+Planet = namedtuple("Planet", "id status")
+Vessel = namedtuple("Vessel", "id name captain type_raw flag")
 
 # Weights to prefer selecting planets for port calls by status
 PLANET_STATUS_WEIGHTS = {
@@ -89,6 +100,14 @@ JUNE_MONTH = 6
 JUNE_DAY_MIN = 1
 JUNE_DAY_MAX = 28  # keep safe for generating previous stops
 
+# Times are kept as whole epoch seconds throughout; the window is computed once
+JUNE_BASE = int(datetime(JUNE_YEAR, JUNE_MONTH, JUNE_DAY_MIN, tzinfo=timezone.utc).timestamp())
+JUNE_SPAN = (JUNE_DAY_MAX - JUNE_DAY_MIN + 1) * 86400
+HOUR = 3600
+
+# Vessels per unit of work (and per random generator) when generating logs
+VESSELS_PER_CHUNK = 64
+
 def parse_args():
     p = argparse.ArgumentParser(description="Generate log.csv from planet and vessel CSVs.")
     p.add_argument("--planets", type=Path, default=PLANET_CSV, help="Path to planet.csv")
@@ -96,36 +115,43 @@ def parse_args():
     p.add_argument("--out", type=Path, default=OUT_CSV, help="Output path for log.csv")
     p.add_argument("--seed", type=int, default=None, help="Random seed")
     p.add_argument("--max-prev", type=int, default=8, help="Hard cap on previous stops per vessel")
+    p.add_argument("--workers", type=int, default=1, help="Worker processes for generating vessel logs")
     return p.parse_args()
 
 def load_planets(path: Path):
-    with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with path.open(newline="", encoding="utf-8", buffering=READ_BUFFER) as f:
+        reader = csv.reader(f)
+        col = {name: i for i, name in enumerate(next(reader, []))}
+        id_i, status_i = col["id"], col.get("status")
         planets = []
         for row in reader:
-            pid = int(row["id"])
-            status = (row.get("status") or "normal").strip().lower()
-            planets.append({"id": pid, "status": status})
+            status = row[status_i] if status_i is not None else ""
+            planets.append(Planet(int(row[id_i]), (status or "normal").strip().lower()))
         if not planets:
             raise ValueError("No planets found in planet.csv")
         return planets
 
 def load_vessels(path: Path):
-    with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with path.open(newline="", encoding="utf-8", buffering=READ_BUFFER) as f:
+        reader = csv.reader(f)
+        col = {name: i for i, name in enumerate(next(reader, []))}
+        # Only id is required; the other columns fall back to "" and 0 when missing
+        id_i = col["id"]
+        name_i, captain_i, type_i, flag_i = (col.get(c) for c in ("name", "captain", "type", "flag"))
         vessels = []
         for row in reader:
-            vessels.append({
-                "id": int(row["id"]),
-                "name": row.get("name", "").strip(),
-                "captain": row.get("captain", "").strip(),
-                "type_raw": row.get("type", "").strip().lower(),
-                "flag": int(row.get("flag", 0)),
-            })
+            vessels.append(Vessel(
+                int(row[id_i]),
+                row[name_i].strip() if name_i is not None else "",
+                row[captain_i].strip() if captain_i is not None else "",
+                row[type_i].strip().lower() if type_i is not None else "",
+                int(row[flag_i]) if flag_i is not None else 0,
+            ))
         if not vessels:
             raise ValueError("No vessels found in vessel.csv")
         return vessels
 
+@lru_cache(maxsize=None)
 def canonical_type(type_raw: str) -> str:
     type_raw = (type_raw or "").lower()
     for canon, tokens in TYPE_MAP.items():
@@ -134,33 +160,31 @@ def canonical_type(type_raw: str) -> str:
                 return canon
     return "unknown"
 
-def pick_planet_weighted(planets, exclude_id=None):
-    items = []
-    weights = []
-    for p in planets:
-        if exclude_id is not None and p["id"] == exclude_id:
-            continue
-        items.append(p["id"])
-        weights.append(PLANET_STATUS_WEIGHTS.get(p["status"], 0.3))
-    # Weighted random choice
-    total = sum(weights)
-    r = random.uniform(0, total)
-    acc = 0.0
-    for item, w in zip(items, weights):
-        acc += w
-        if r <= acc:
+@lru_cache(maxsize=None)
+def resolve_profile(type_raw: str) -> dict:
+    # Vessels share a handful of type strings, so each is resolved once
+    return TYPE_PROFILES.get(canonical_type(type_raw), DEFAULT_PROFILE)
+
+def build_planet_table(planets):
+    # Alias table over the planet ids, built once per run for pick_planet_weighted
+    return build_alias_table([p.id for p in planets], [PLANET_STATUS_WEIGHTS.get(p.status, 0.3) for p in planets])
+
+def pick_planet_weighted(rng, planet_table, exclude_id=None):
+    ids = planet_table[0]
+    if exclude_id is not None and len(ids) == 1 and ids[0] == exclude_id:
+        return None
+    while True:
+        item = alias_choice(rng, planet_table)
+        # Redrawing on the excluded id samples exactly the remaining weights
+        if item != exclude_id:
             return item
-    return items[-1]
 
-def sample_int_hours(lo, hi):
-    return random.randint(int(lo), int(max(lo, hi)))
+def sample_int_hours(rng, lo, hi):
+    return rng.randint(int(lo), int(max(lo, hi)))
 
-def random_datetime_in_june():
-    day = random.randint(JUNE_DAY_MIN, JUNE_DAY_MAX)
-    hour = random.randint(0, 23)
-    minute = random.randint(0, 59)
-    second = random.randint(0, 59)
-    return datetime(JUNE_YEAR, JUNE_MONTH, day, hour, minute, second, tzinfo=timezone.utc)
+def random_time_in_june(rng):
+    # Whole second in the window, as epoch seconds
+    return JUNE_BASE + rng.randrange(JUNE_SPAN)
 
 def ensure_not_same_port(prev_port, candidate_port):
     # small helper to avoid immediate repeated port where possible
@@ -170,111 +194,127 @@ def ensure_not_same_port(prev_port, candidate_port):
         return None
     return candidate_port
 
-def generate_logs(planets, vessels, out_path: Path, seed=None, max_prev=8):
-    if seed is not None:
-        random.seed(seed)
+def vessel_stops(rng, v, planet_ids, planet_table, max_prev=8):
+    # One vessel's port calls as (port, arrival, departure): its previous stops,
+    # most recent first, then the June 2973 arrival.
+
+    # Bound once, used for every stop below
+    randint = rng.randint
+    uniform = rng.uniform
+    rand = rng.random
+
+    # derive profile
+    profile = resolve_profile(v.type_raw)
+
+    prev_min, prev_max = profile["prev_range"]
+    # Respect the global hard cap
+    prev_max = min(prev_max, max_prev)
+    if prev_max < prev_min:
+        prev_max = prev_min
+    prev_count = randint(prev_min, prev_max)
+
+    # Final arrival in June 2973
+    final_arrival = random_time_in_june(rng)
+    stay_lo, stay_hi = profile["stay_hours"]
+    final_stay_h = sample_int_hours(rng, stay_lo, stay_hi)
+    final_departure = final_arrival + final_stay_h * HOUR
+
+    # pick final port with bias towards flag
+    if rand() < FINAL_PORT_FLAG_BIAS and v.flag in planet_ids:
+        final_port = v.flag
+    else:
+        final_port = pick_planet_weighted(rng, planet_table)
+
+    # Build previous stops backwards from the final arrival
+    next_arrival = final_arrival
+    next_port = final_port
+    stops = []
+
+    # Ranges used by every previous stop, unpacked once
+    travel_lo, travel_hi = profile["travel_hours"]
+    stay_lo_half = stay_lo * 0.5  # allow shorter stays sometimes
+
+    # Generate previous stops in reverse chronological order
+    for i in range(prev_count):
+        travel_h = uniform(travel_lo, travel_hi)
+        # previous departure is next_arrival - travel_time
+        prev_departure = next_arrival - int(travel_h * HOUR)
+
+        # stay duration at previous port
+        prev_stay_h = uniform(stay_lo_half, stay_hi)
+        prev_arrival = prev_departure - int(prev_stay_h * HOUR)
+
+        # choose a port for this previous stop (avoid immediate repetition where possible)
+        candidate = pick_planet_weighted(rng, planet_table, exclude_id=next_port)
+        if candidate is None:
+            # fallback to any planet
+            candidate = rng.choice(planet_ids)
+
+        stops.append((candidate, prev_arrival, prev_departure))
+
+        # set up for next previous
+        next_arrival = prev_arrival
+        next_port = candidate
+
+    # Finally the June 2973 arrival (most recent)
+    stops.append((final_port, final_arrival, final_departure))
+    return stops
+
+def chunk_stops(chunk, planet_ids, planet_table, max_prev=8, seed=None):
+    # vessel_stops for each vessel of chunk = (index, vessels). Each chunk has its own
+    # generator, seeded from (seed, index) in a seeded run, so the output does not
+    # depend on which process handles which chunk.
+    index, vessels = chunk
+    rng = random.Random(f"{seed}:{index}" if seed is not None else None)
+    return [vessel_stops(rng, v, planet_ids, planet_table, max_prev) for v in vessels]
+
+def iter_logs(planets, vessels, max_prev=8, seed=None, workers=1):
+    # Yields one list of row tuples (LOG_COLUMNS order) per vessel. Vessels are
+    # independent, so with workers > 1 chunks of them are generated in a process
+    # pool; log ids are assigned here, in vessel order.
+
+    # Precompute planet ids for fallback choices, and the weighted lookup table
+    planet_ids = [p.id for p in planets]
+    planet_table = build_planet_table(planets)
+    stops_for = partial(chunk_stops, planet_ids=planet_ids, planet_table=planet_table, max_prev=max_prev, seed=seed)
+    chunks = enumerate(vessels[i:i + VESSELS_PER_CHUNK] for i in range(0, len(vessels), VESSELS_PER_CHUNK))
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            yield from number_rows(vessels, chain.from_iterable(pool.map(stops_for, chunks)))
+    else:
+        yield from number_rows(vessels, chain.from_iterable(map(stops_for, chunks)))
+
+def number_rows(vessels, all_stops):
+    log_id = 1
+    for v, stops in zip(vessels, all_stops):
+        yield [(log_id + i, port, arrival, departure, v.id) for i, (port, arrival, departure) in enumerate(stops)]
+        log_id += len(stops)
+
+def generate_logs(planets, vessels, out_path: Path, seed=None, max_prev=8, workers=1):
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    rows = []
-    log_id = 1
+    # Rows are not shuffled: each vessel's rows stay together, in the order they are
+    # generated. If you want shuffled output, collect the rows and call random.shuffle.
+
+    # Stream each vessel's rows to the CSV as soon as they are generated
+    written = 0
+    with out_path.open("w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_COLUMNS)
+        for rows in iter_logs(planets, vessels, max_prev, seed, workers):
+            writer.writerows(rows)
+            written += len(rows)
 
-    # Precompute planet ids for fallback choices
-    planet_ids = [p["id"] for p in planets]
-
-    for v in vessels:
-        # derive profile
-        canon = canonical_type(v["type_raw"])
-        profile = TYPE_PROFILES.get(canon, DEFAULT_PROFILE)
-
-        prev_min, prev_max = profile["prev_range"]
-        # Respect the global hard cap
-        prev_max = min(prev_max, max_prev)
-        if prev_max < prev_min:
-            prev_max = prev_min
-        prev_count = random.randint(prev_min, prev_max)
-
-        # Final arrival in June 2973
-        final_arrival_dt = random_datetime_in_june()
-        stay_lo, stay_hi = profile["stay_hours"]
-        final_stay_h = sample_int_hours(stay_lo, stay_hi)
-        final_departure_dt = final_arrival_dt + timedelta(hours=final_stay_h)
-
-        # pick final port with bias towards flag
-        if random.random() < FINAL_PORT_FLAG_BIAS and v["flag"] in planet_ids:
-            final_port = v["flag"]
-        else:
-            final_port = pick_planet_weighted(planets)
-
-        # Build previous stops backwards from the final arrival
-        next_arrival = final_arrival_dt
-        next_port = final_port
-
-        # Generate previous stops in reverse chronological order
-        for i in range(prev_count):
-            travel_lo, travel_hi = profile["travel_hours"]
-            stay_lo, stay_hi = profile["stay_hours"]
-
-            travel_h = random.uniform(travel_lo, travel_hi)
-            # previous departure is next_arrival - travel_time
-            prev_departure_dt = next_arrival - timedelta(hours=travel_h)
-
-            # stay duration at previous port
-            prev_stay_h = random.uniform(stay_lo * 0.5, stay_hi)  # allow shorter stays sometimes
-            prev_arrival_dt = prev_departure_dt - timedelta(hours=prev_stay_h)
-
-            # choose a port for this previous stop (avoid immediate repetition where possible)
-            candidate = pick_planet_weighted(planets, exclude_id=next_port)
-            if candidate is None:
-                # fallback to any planet
-                candidate = random.choice(planet_ids)
-
-            # append row
-            rows.append({
-                "id": log_id,
-                "port": candidate,
-                "arrival": int(prev_arrival_dt.timestamp()),
-                "departure": int(prev_departure_dt.timestamp()),
-                "vessel": v["id"],
-            })
-            log_id += 1
-
-            # set up for next previous
-            next_arrival = prev_arrival_dt
-            next_port = candidate
-
-        # Finally append the June 2973 arrival (most recent)
-        rows.append({
-            "id": log_id,
-            "port": final_port,
-            "arrival": int(final_arrival_dt.timestamp()),
-            "departure": int(final_departure_dt.timestamp()),
-            "vessel": v["id"],
-        })
-        log_id += 1
-
-    # Optionally shuffle rows to avoid strict vessel-grouping (keeps CSV varied).
-    # Keep chronological ordering per vessel would be broken by shuffle; we will not shuffle
-    # to preserve increasing chronological order of the appended rows (older entries first,
-    # final arrival last for each vessel). If you want shuffled output, call random.shuffle(rows).
-
-    # Write CSV
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["id", "port", "arrival", "departure", "vessel"])
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
-
-    print(f"Wrote {len(rows)} log rows to {out_path} (for {len(vessels)} vessels).")
+    print(f"Wrote {written} log rows to {out_path} (for {len(vessels)} vessels).")
 
 def main():
     args = parse_args()
-    if args.seed is not None:
-        random.seed(args.seed)
 
     planets = load_planets(args.planets)
     vessels = load_vessels(args.vessels)
 
-    generate_logs(planets, vessels, args.out, seed=args.seed, max_prev=args.max_prev)
+    generate_logs(planets, vessels, args.out, seed=args.seed, max_prev=args.max_prev, workers=args.workers)
 
 if __name__ == "__main__":
     main()
@@ -22,10 +22,18 @@ from pathlib import Path
 import csv
 import random
 import argparse
+from collections import namedtuple
+
+from csv_io import READ_BUFFER, WRITE_BUFFER
+from sampling import alias_choices, build_alias_table
 
 PLANET_CSV = Path("data/planet.csv")
 VESSEL_CSV = Path("data/vessel.csv")
 PASSENGER_CSV = Path("data/passenger.csv")
+PASSENGER_COLUMNS = ("name", "type", "nationality", "vessel")
+
+Planet = namedtuple("Planet", "id status")
+Vessel = namedtuple("Vessel", "id name captain type flag")
 
 # How many people per vessel type (ranges are inclusive)
 # Counts are for additional people beyond the captain.
@@ -81,136 +89,134 @@ def parse_args():
     return p.parse_args()
 
 def load_planets(path: Path):
-    with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with path.open(newline="", encoding="utf-8", buffering=READ_BUFFER) as f:
+        reader = csv.reader(f)
+        col = {name: i for i, name in enumerate(next(reader, []))}
+        id_i, status_i = col["id"], col.get("status")
         planets = []
         for row in reader:
-            planets.append({
-                "id": int(row["id"]),
-                "status": (row.get("status") or "normal").strip().lower()
-            })
+            status = row[status_i] if status_i is not None else ""
+            planets.append(Planet(int(row[id_i]), (status or "normal").strip().lower()))
     if not planets:
         raise ValueError("planet.csv is empty")
     return planets
 
 def load_vessels(path: Path):
-    with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with path.open(newline="", encoding="utf-8", buffering=READ_BUFFER) as f:
+        reader = csv.reader(f)
+        col = {name: i for i, name in enumerate(next(reader, []))}
+        id_i, name_i, captain_i, type_i, flag_i = (col[c] for c in ("id", "name", "captain", "type", "flag"))
         vessels = []
         for row in reader:
-            vessels.append({
-                "id": int(row["id"]),
-                "name": row["name"],
-                "captain": row["captain"],
-                "type": row["type"].strip().lower(),
-                "flag": int(row["flag"]),
-            })
+            vessels.append(Vessel(
+                int(row[id_i]),
+                row[name_i],
+                row[captain_i],
+                row[type_i].strip().lower(),
+                int(row[flag_i]),
+            ))
     if not vessels:
         raise ValueError("vessel.csv is empty")
     return vessels
 
-def weighted_choice(items, weights):
-    total = sum(weights)
-    r = random.uniform(0, total)
-    acc = 0.0
-    for item, w in zip(items, weights):
-        acc += w
-        if r <= acc:
-            return item
-    return items[-1]
-
-def pick_planet_id(planets):
-    items = [p["id"] for p in planets]
-    weights = [NATIONALITY_WEIGHTS.get(p["status"], 0.3) for p in planets]
-    return weighted_choice(items, weights)
-
-def unique_name(existing: set, preferred: str | None = None) -> str:
+def build_planet_table(planets):
+    # Alias table over the planet ids, built once per run for pick_planet_ids
+    return build_alias_table([p.id for p in planets], [NATIONALITY_WEIGHTS.get(p.status, 0.3) for p in planets])
+
+def pick_planet_ids(rng: random.Random, planet_table, k):
+    return alias_choices(rng, planet_table, k)
+
+def make_name_pool(rng: random.Random) -> list[str]:
+    # Every first name/surname combination once, shuffled; names are popped off the end
+    pool = [f"{fn} {sn}" for fn in FIRST_NAMES for sn in SURNAMES]
+    rng.shuffle(pool)
+    return pool
+
+def draw_names(rng: random.Random, existing: set, pool: list, next_suffix: dict, k: int) -> list[str]:
+    return [unique_name(rng, existing, pool, next_suffix) for _ in range(k)]
+
+def unique_name(rng: random.Random, existing: set, pool: list, next_suffix: dict, preferred: str | None = None) -> str:
     if preferred and preferred not in existing:
         existing.add(preferred)
         return preferred
-    # Try a few random combinations before suffixing
-    for _ in range(50):
-        name = f"{random.choice(FIRST_NAMES)} {random.choice(SURNAMES)}"
+    # Unused combinations first; captains' names may already have taken some
+    while pool:
+        name = pool.pop()
         if name not in existing:
             existing.add(name)
             return name
-    # Suffix until unique
-    idx = 2
-    base = preferred or f"{random.choice(FIRST_NAMES)} {random.choice(SURNAMES)}"
-    name = base
+    # Suffix until unique, resuming from the last suffix handed out for this base
+    base = preferred or f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}"
+    idx = next_suffix.get(base, 1)
+    name = base if idx == 1 else f"{base} #{idx}"
     while name in existing:
-        name = f"{base} #{idx}"
         idx += 1
+        name = f"{base} #{idx}"
+    next_suffix[base] = idx + 1
     existing.add(name)
     return name
 
-def scaled_randint(lo: int, hi: int, scale: float) -> int:
+def scaled_randint(rng: random.Random, lo: int, hi: int, scale: float) -> int:
     lo = max(0, int(round(lo * scale)))
     hi = max(lo, int(round(hi * scale)))
-    return random.randint(lo, hi)
-
-def generate_passengers(planets, vessels, out_path: Path, scale: float = 1.0):
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    return rng.randint(lo, hi)
 
+def iter_passengers(rng: random.Random, planets, vessels, scale: float = 1.0):
+    # Yields one list of row tuples (PASSENGER_COLUMNS order) per vessel:
+    # captain, then crew, then passengers
     names_seen = set()
-    rows = []
+    name_pool = make_name_pool(rng)
+    next_suffix = {}
 
     # Make a quick lookup for planets by id to get statuses if needed later
-    planet_by_id = {p["id"]: p for p in planets}
+    planet_by_id = {p.id: p for p in planets}
+    planet_table = build_planet_table(planets)
+
+    rand = rng.random
 
     for v in vessels:
-        vtype = v["type"]
+        vtype = v.type
         profile = TYPE_PROFILE.get(vtype, {"crew": (6, 18), "passenger": (0, 6)})
 
         # Captain
-        captain_name = unique_name(names_seen, preferred=v["captain"])
-        rows.append({
-            "name": captain_name,
-            "type": "captain",
-            "nationality": v["flag"],  # captain registered to the flag world
-            "vessel": v["id"],
-        })
-
-        # Crew
-        crew_n = scaled_randint(*profile["crew"], scale)
-        for _ in range(crew_n):
-            name = unique_name(names_seen)
+        captain_name = unique_name(rng, names_seen, name_pool, next_suffix, preferred=v.captain)
+        # captain registered to the flag world
+        rows = [(captain_name, "captain", v.flag, v.id)]
+        append = rows.append
+
+        # Crew, drawn as a batch
+        crew_n = scaled_randint(rng, *profile["crew"], scale)
+        crew_nats = pick_planet_ids(rng, planet_table, crew_n)
+        for name, nat in zip(draw_names(rng, names_seen, name_pool, next_suffix, crew_n), crew_nats):
             # Many crew share flag nationality; otherwise weighted pick
-            if random.random() < CREW_FLAG_PROB:
-                nat = v["flag"]
-            else:
-                nat = pick_planet_id(planets)
-            rows.append({
-                "name": name,
-                "type": "crew",
-                "nationality": nat,
-                "vessel": v["id"],
-            })
-
-        # Passengers
-        pax_n = scaled_randint(*profile["passenger"], scale)
-        for _ in range(pax_n):
-            name = unique_name(names_seen)
-            nat = pick_planet_id(planets)
-            rows.append({
-                "name": name,
-                "type": "passenger",
-                "nationality": nat,
-                "vessel": v["id"],
-            })
-
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["name", "type", "nationality", "vessel"])
-        writer.writeheader()
-        writer.writerows(rows)
+            if rand() < CREW_FLAG_PROB:
+                nat = v.flag
+            append((name, "crew", nat, v.id))
+
+        # Passengers, drawn as a batch
+        pax_n = scaled_randint(rng, *profile["passenger"], scale)
+        pax_nats = pick_planet_ids(rng, planet_table, pax_n)
+        for name, nat in zip(draw_names(rng, names_seen, name_pool, next_suffix, pax_n), pax_nats):
+            append((name, "passenger", nat, v.id))
+
+        yield rows
+
+def generate_passengers(planets, vessels, out_path: Path, scale: float = 1.0, seed=None):
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+
+    # One vessel's passengers at a time, so memory doesn't grow with the output
+    with out_path.open("w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(PASSENGER_COLUMNS)
+        for rows in iter_passengers(rng, planets, vessels, scale):
+            writer.writerows(rows)
 
 def main():
     args = parse_args()
-    if args.seed is not None:
-        random.seed(args.seed)
     planets = load_planets(args.planets)
     vessels = load_vessels(args.vessels)
-    generate_passengers(planets, vessels, args.out, scale=args.scale)
+    generate_passengers(planets, vessels, args.out, scale=args.scale, seed=args.seed)
 
 if __name__ == "__main__":
     main()
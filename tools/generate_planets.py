@@ -18,8 +18,13 @@ from pathlib import Path
 import csv
 import random
 import argparse
+from bisect import bisect_right
+from itertools import accumulate
+
+from csv_io import WRITE_BUFFER
 
 OUT_PATH = Path("data/planet.csv")
+PLANET_COLUMNS = ("id", "name", "mass", "status")
 
 STATUSES = [
     ("normal", 0.78),
@@ -60,19 +65,19 @@ CITIES = [
 
 ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI", "XII"]
 
-def weighted_choice(pairs):
-    r = random.random()
-    acc = 0.0
-    for value, weight in pairs:
-        acc += weight
-        if r <= acc:
-            return value
-    return pairs[-1][0]
+# Statuses and their cumulative weights, for pick_status
+STATUS_VALUES = [value for value, _ in STATUSES]
+STATUS_CUM_WEIGHTS = list(accumulate(weight for _, weight in STATUSES))
+
+def pick_status(rng):
+    return STATUS_VALUES[bisect_right(STATUS_CUM_WEIGHTS, rng.random() * STATUS_CUM_WEIGHTS[-1])]
 
-def pick_status():
-    return weighted_choice(STATUSES)
+# Mass classes for sample_mass: cumulative class boundaries (the last class takes the rest)
+# and the (lo, hi) range of each class
+MASS_CDF = [0.05, 0.60, 0.85, 0.95]
+MASS_RANGES = [(0.05, 0.30), (0.30, 2.00), (2.00, 10.00), (10.00, 20.00), (50.0, 318.0)]
 
-def sample_mass():
+def sample_mass(rng):
     """
     Return a planet mass in Earth masses (M⊕) using weighted classes:
       - Dwarf (0.05–0.3): 5%
@@ -81,84 +86,80 @@ def sample_mass():
       - Mini-Neptune (10–20): 10%
       - Gas giant (50–318): 5%
     """
-    r = random.random()
-    if r < 0.05:
-        return round(random.uniform(0.05, 0.30), 3)
-    elif r < 0.60:
-        return round(random.uniform(0.30, 2.00), 3)
-    elif r < 0.85:
-        return round(random.uniform(2.00, 10.00), 3)
-    elif r < 0.95:
-        return round(random.uniform(10.00, 20.00), 3)
-    else:
-        return round(random.uniform(50.0, 318.0), 3)
-
-def name_catalogue():
-    prefix = random.choice(CATALOG_PREFIX)
-    number = random.randint(100, 99999)
-    suffix = random.choice(list("bcdefgh"))
-    return f"{prefix} {number} {suffix}"
-
-def name_greek_constellation():
-    return f"{random.choice(GREEK)} {random.choice(CONSTELLATIONS)} {random.choice(ROMAN)}"
-
-def name_mythic_roman():
-    return f"{random.choice(MYTHIC)} {random.choice(ROMAN)}"
-
-def name_new_colony():
-    return f"New {random.choice(CITIES)}"
-
-def generate_name():
+    lo, hi = MASS_RANGES[bisect_right(MASS_CDF, rng.random())]
+    return round(rng.uniform(lo, hi), 3)
+
+# Name patterns, each building k names at once: catalogue designation, Greek letter
+# + constellation + Roman numeral, mythic + Roman numeral, New <City>
+def catalogue_names(rng, k):
+    return [
+        f"{prefix} {number} {suffix}"
+        for prefix, number, suffix in zip(
+            rng.choices(CATALOG_PREFIX, k=k),
+            [rng.randrange(100, 100000) for _ in range(k)],
+            rng.choices("bcdefgh", k=k),
+        )
+    ]
+
+def greek_constellation_names(rng, k):
+    return [
+        f"{letter} {constellation} {numeral}"
+        for letter, constellation, numeral in zip(
+            rng.choices(GREEK, k=k), rng.choices(CONSTELLATIONS, k=k), rng.choices(ROMAN, k=k)
+        )
+    ]
+
+def mythic_roman_names(rng, k):
+    return [f"{name} {numeral}" for name, numeral in zip(rng.choices(MYTHIC, k=k), rng.choices(ROMAN, k=k))]
+
+def new_colony_names(rng, k):
+    return [f"New {city}" for city in rng.choices(CITIES, k=k)]
+
+NAME_PATTERNS = (catalogue_names, greek_constellation_names, mythic_roman_names, new_colony_names)
+# Cumulative weights of NAME_PATTERNS: 35%, 30%, 20%, 15%
+NAME_PATTERN_CDF = [0.35, 0.65, 0.85]
+
+def generate_names(rng, n):
     """
-    Blend patterns with weights:
-      - Catalogue designation: 35%
-      - Greek letter + constellation + Roman numeral: 30%
-      - Mythic + Roman: 20%
-      - New <City>: 15%
+    Draw n candidate names, in bulk: one pattern per slot, then every name of
+    each pattern at once.
     """
-    r = random.random()
-    if r < 0.35:
-        return name_catalogue()
-    elif r < 0.65:
-        return name_greek_constellation()
-    elif r < 0.85:
-        return name_mythic_roman()
-    else:
-        return name_new_colony()
+    rand = rng.random
+    patterns = [bisect_right(NAME_PATTERN_CDF, rand()) for _ in range(n)]
+    by_pattern = [iter(build(rng, patterns.count(i))) for i, build in enumerate(NAME_PATTERNS)]
+    return [next(by_pattern[i]) for i in patterns]
+
+def generate_name(rng):
+    return generate_names(rng, 1)[0]
 
 def generate_planets(n, seed=None):
-    if seed is not None:
-        random.seed(seed)
+    rng = random.Random(seed)
 
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     names_seen = set()
     rows = []
 
-    for pid in range(1, n + 1):
-        # Ensure unique names
-        for _ in range(100):
-            name = generate_name()
-            if name not in names_seen:
-                names_seen.add(name)
-                break
-        else:
-            # Fallback if somehow 100 collisions
-            name = f"{name_catalogue()}-{pid}"
-
-        mass = sample_mass()
-        status = pick_status()
-
-        rows.append({
-            "id": pid,
-            "name": name,
-            "mass": mass,
-            "status": status
-        })
-
-    with OUT_PATH.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["id", "name", "mass", "status"])
-        writer.writeheader()
+    for pid, name in enumerate(generate_names(rng, n), 1):
+        # Ensure unique names; only clashes fall back to drawing one at a time
+        if name in names_seen:
+            for _ in range(100):
+                name = generate_name(rng)
+                if name not in names_seen:
+                    break
+            else:
+                # Fallback if somehow 100 collisions
+                name = f"{catalogue_names(rng, 1)[0]}-{pid}"
+        names_seen.add(name)
+
+        mass = sample_mass(rng)
+        status = pick_status(rng)
+
+        rows.append((pid, name, mass, status))
+
+    with OUT_PATH.open("w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(PLANET_COLUMNS)
         writer.writerows(rows)
 
 def parse_args():
@@ -21,9 +21,16 @@ from pathlib import Path
 import csv
 import random
 import argparse
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, product
+from math import prod
+
+from csv_io import READ_BUFFER, WRITE_BUFFER
 
 PLANET_CSV = Path("data/planet.csv")
 VESSEL_CSV = Path("data/vessel.csv")
+VESSEL_COLUMNS = ("id", "name", "captain", "type", "flag")
 
 # Weighting for choosing a planet as a flag, based on its status
 STATUS_FLAG_WEIGHTS = {
@@ -49,36 +56,36 @@ VESSEL_TYPES = [
     ("spice clipper", 0.04),
 ]
 
-# Name parts for vessels
-PREFIXES = ["SS", "MV", "CSV", "TSS", "HSS", "RV", "BCV"]
-ADJECTIVES = [
+# Name parts for vessels, deduplicated once (order kept) and stored as tuples
+PREFIXES = tuple(dict.fromkeys(["SS", "MV", "CSV", "TSS", "HSS", "RV", "BCV"]))
+ADJECTIVES = tuple(dict.fromkeys([
     "Azure", "Crimson", "Obsidian", "Amber", "Silent", "Vigilant", "Radiant",
     "Stellar", "Drifting", "Iron", "Golden", "Silver", "Nebular", "Quantum",
     "Luminous", "Wayfarer", "Eclipse", "Solar", "Aether", "Celestial",
     "Cutty",
-]
-NOUNS = [
+]))
+NOUNS = tuple(dict.fromkeys([
     "Nomad", "Kite", "Dawn", "Paradox", "Harbinger", "Serpent", "Pioneer",
     "Voyager", "Courier", "Beacon", "Comet", "Pilgrim", "Anchor", "Caravel",
-    "Skylark", "Prospector", "Mariner", "Venture", "Tempest", "Sparrow", "Sark"
-]
-ROMAN = ["", " II", " III", " IV", " V"]
+    "Skylark", "Prospector", "Mariner", "Venture", "Tempest", "Sparrow", "Sark",
+]))
+ROMAN = ("", " II", " III", " IV", " V")
 
 # International-flavoured names (plain, no titles)
-FIRST_NAMES = [
+FIRST_NAMES = tuple(dict.fromkeys([
     "Alex", "Samira", "Diego", "Mei", "Noah", "Aisha", "Karim", "Sofia", "Luca",
     "Yara", "Tariq", "Nina", "Jonas", "Ravi", "Leila", "Kaito", "Marta", "Omar",
     "Ibrahim", "Priya", "Ines", "Serge", "Dara", "Han", "Arman", "Zoe", "Nikolai",
-    "Tess", "Amir", "Chioma", "Eli", "Mina", "Mateo", "Anika", "Farid", "Rosa"
+    "Tess", "Amir", "Chioma", "Eli", "Mina", "Mateo", "Anika", "Farid", "Rosa",
     "Will",
-]
-SURNAMES = [
+]))
+SURNAMES = tuple(dict.fromkeys([
     "Okoye", "Fernandez", "Singh", "Johansson", "Khan", "Miller", "Garcia", "Chen",
     "Haddad", "Nakamura", "Silva", "Novak", "Rossi", "Patel", "Dubois", "Iversen",
     "Kim", "Hussein", "Santos", "Petrova", "Kowalski", "Hernandez", "Abebe",
-    "Yamamoto", "Adebayo", "Popov", "Carter", "Moreau", "Gonzalez", "Li"
+    "Yamamoto", "Adebayo", "Popov", "Carter", "Moreau", "Gonzalez", "Li",
     "Nguyen", "Holland", "Nguyen Le", "Tram", "Ho",
-]
+]))
 
 def parse_args():
     p = argparse.ArgumentParser(description="Generate vessel.csv using planet.csv as flags.")
@@ -89,87 +96,128 @@ def parse_args():
     return p.parse_args()
 
 def load_planets(path: Path):
-    with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        planets = []
+    # Column-wise: (planet ids, statuses) as parallel sequences, no object per planet
+    with path.open(newline="", encoding="utf-8", buffering=READ_BUFFER) as f:
+        reader = csv.reader(f)
+        col = {name: i for i, name in enumerate(next(reader, []))}
+        id_i, status_i = col["id"], col.get("status")
+        ids = array("q")
+        statuses = []
         for row in reader:
-            # Ensure required fields exist and are correctly typed
-            pid = int(row["id"])
-            status = (row.get("status") or "normal").strip().lower()
-            planets.append({"id": pid, "status": status})
-        if not planets:
+            ids.append(int(row[id_i]))
+            status = row[status_i] if status_i is not None else ""
+            statuses.append((status or "normal").strip().lower())
+        if not ids:
             raise ValueError("No planets found in planet.csv")
-        return planets
-
-def weighted_choice(items, weights):
-    total = sum(weights)
-    r = random.uniform(0, total)
-    acc = 0.0
-    for item, w in zip(items, weights):
-        acc += w
-        if r <= acc:
-            return item
-    return items[-1]
-
-def pick_flag(planets):
-    weights = [STATUS_FLAG_WEIGHTS.get(p["status"], 0.1) for p in planets]
-    chosen = weighted_choice(planets, weights)
-    return chosen["id"]
-
-def pick_type():
-    return weighted_choice([t for t, _ in VESSEL_TYPES], [w for _, w in VESSEL_TYPES])
-
-def make_vessel_name(existing: set):
-    # 3 mixed patterns for variety
-    pattern = random.random()
-    if pattern < 0.45:
-        name = f"{random.choice(PREFIXES)} {random.choice(ADJECTIVES)} {random.choice(NOUNS)}{random.choice(ROMAN)}"
-    elif pattern < 0.80:
-        name = f"{random.choice(ADJECTIVES)} {random.choice(NOUNS)}{random.choice(ROMAN)}"
-    else:
-        # Corporate / designation style
-        name = f"{random.choice(PREFIXES)}-{random.randint(100, 9999)} {random.choice(NOUNS)}"
-
-    # Ensure uniqueness
-    if name in existing:
-        # Add a numeric suffix until unique
-        base = name
-        idx = 2
-        while name in existing:
-            name = f"{base} ({idx})"
-            idx += 1
-    existing.add(name)
-    return name
-
-def make_captain_name():
-    return f"{random.choice(FIRST_NAMES)} {random.choice(SURNAMES)}"
+        return ids, statuses
+
+# Type names and their cumulative weights, for pick_types
+TYPE_NAMES = [t for t, _ in VESSEL_TYPES]
+TYPE_CUM_WEIGHTS = list(accumulate(w for _, w in VESSEL_TYPES))
+
+def build_flag_table(planets):
+    # (planet ids, cumulative flag weights), built once per run
+    ids, statuses = planets
+    cum_weights = list(accumulate(STATUS_FLAG_WEIGHTS.get(status, 0.1) for status in statuses))
+    return ids, cum_weights
+
+def pick_flags(rng, flag_table, count):
+    ids, cum_weights = flag_table
+    return rng.choices(ids, cum_weights=cum_weights, k=count)
+
+def pick_types(rng, count):
+    return rng.choices(TYPE_NAMES, cum_weights=TYPE_CUM_WEIGHTS, k=count)
+
+# Cumulative weights of the 3 vessel name patterns: prefixed, plain, corporate
+NAME_PATTERN_CDF = [0.45, 0.80]
+
+# Parts of each name pattern, one item drawn from each
+PREFIXED_PARTS = (PREFIXES, ADJECTIVES, NOUNS, ROMAN)
+PLAIN_PARTS = (ADJECTIVES, NOUNS, ROMAN)
+CORPORATE_PARTS = (PREFIXES, range(100, 10000), NOUNS)
+
+# Patterns with up to this many combinations are listed outright before sampling
+MAX_LISTED_COMBINATIONS = 100_000
+
+def sample_parts(rng, parts, k):
+    # k combinations of one item from each of parts: distinct until the combinations
+    # run out, after which they repeat earlier ones
+    sizes = [len(items) for items in parts]
+    total = prod(sizes)
+    if total <= MAX_LISTED_COMBINATIONS:
+        combos = list(product(*parts))
+        picked = rng.sample(combos, min(k, total))
+        if k > total:
+            picked += rng.choices(combos, k=k - total)
+        return picked
+
+    # Too many combinations to list: sample their indexes and decode those
+    indexes = rng.sample(range(total), min(k, total))
+    if k > total:
+        indexes += rng.choices(range(total), k=k - total)
+    picked = []
+    for index in indexes:
+        combo = []
+        for items, size in zip(reversed(parts), reversed(sizes)):
+            index, i = divmod(index, size)
+            combo.append(items[i])
+        picked.append(combo[::-1])
+    return picked
+
+def number_repeats(names):
+    # Later copies of a name get a numeric suffix: "X", "X (2)", "X (3)", ...
+    seen = {}
+    numbered = []
+    for name in names:
+        n = seen.get(name, 0) + 1
+        seen[name] = n
+        numbered.append(name if n == 1 else f"{name} ({n})")
+    return numbered
+
+def draw_vessel_names(rng, count):
+    # Unique names for count vessels: a pattern per vessel, then distinct combinations
+    # of each pattern's parts for all of its vessels at once. Patterns never produce
+    # each other's names, so suffixes are only needed once a pattern runs out.
+    rand = rng.random
+    patterns = [bisect_right(NAME_PATTERN_CDF, rand()) for _ in range(count)]
+    n_prefixed, n_plain, n_corporate = (patterns.count(i) for i in range(3))
+
+    prefixed = [f"{prefix} {adj} {noun}{roman}" for prefix, adj, noun, roman in sample_parts(rng, PREFIXED_PARTS, n_prefixed)]
+    plain = [f"{adj} {noun}{roman}" for adj, noun, roman in sample_parts(rng, PLAIN_PARTS, n_plain)]
+    # Corporate / designation style
+    corporate = [f"{prefix}-{number} {noun}" for prefix, number, noun in sample_parts(rng, CORPORATE_PARTS, n_corporate)]
+
+    # sample_parts only repeats a name once its pattern's combinations run out, so a
+    # pattern with fewer vessels than that skips the numbering (and its hashing) entirely
+    by_pattern = [
+        iter(number_repeats(names) if len(names) > prod(map(len, parts)) else names)
+        for names, parts in ((prefixed, PREFIXED_PARTS), (plain, PLAIN_PARTS), (corporate, CORPORATE_PARTS))
+    ]
+    return [next(by_pattern[i]) for i in patterns]
+
+# Every first name + surname pairing, assembled once so captains are a single draw
+CAPTAIN_NAMES = tuple(f"{first} {last}" for first, last in product(FIRST_NAMES, SURNAMES))
+
+def make_captain_names(rng, count):
+    return rng.choices(CAPTAIN_NAMES, k=count)
 
 def generate_vessels(count, planets, out_path: Path, seed=None):
-    if seed is not None:
-        random.seed(seed)
+    # A generator of our own rather than the shared module-level one
+    rng = random.Random(seed)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    names_seen = set()
-    rows = []
-    for vid in range(1, count + 1):
-        vtype = pick_type()
-        name = make_vessel_name(names_seen)
-        captain = make_captain_name()
-        flag = pick_flag(planets)
-
-        rows.append({
-            "id": vid,
-            "name": name,
-            "captain": captain,
-            "type": vtype,
-            "flag": flag,
-        })
-
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["id", "name", "captain", "type", "flag"])
-        writer.writeheader()
-        writer.writerows(rows)
+    # Every column is drawn for all vessels up front
+    types = pick_types(rng, count)
+    names = draw_vessel_names(rng, count)
+    captains = make_captain_names(rng, count)
+    flags = pick_flags(rng, build_flag_table(planets), count)
+
+    # Rows are zipped from the columns as the writer consumes them, never held as a list
+    with out_path.open("w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(VESSEL_COLUMNS)
+        writer.writerows(zip(range(1, count + 1), names, captains, types, flags))
 
 def main():
     args = parse_args()
@@ -0,0 +1,39 @@
+''' weighted sampling shared by the generator scripts '''
+
+def build_alias(weights):
+    ''' Vose's alias method: returns (prob, alias) so that a weighted draw is one
+        uniform index plus one biased coin flip, whatever the number of items '''
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+    # Whatever is left over is 1.0 up to rounding, so keeps prob 1.0
+    return prob, alias
+
+def build_alias_table(items, weights):
+    ''' (items, alias probabilities, aliases) for alias_choice and alias_choices '''
+    prob, alias = build_alias(weights)
+    return items, prob, alias
+
+def alias_choice(rng, table):
+    ''' one weighted item from an alias table, in O(1) '''
+    items, prob, alias = table
+    i = int(rng.random() * len(items))
+    return items[i] if rng.random() < prob[i] else items[alias[i]]
+
+def alias_choices(rng, table, k):
+    ''' k weighted items from an alias table, each in O(1) '''
+    items, prob, alias = table
+    n = len(items)
+    rand = rng.random
+    return [items[i] if rand() < prob[i] else items[alias[i]] for i in [int(rand() * n) for _ in range(k)]]